@@ -9,8 +9,11 @@ import report_email
 import memo_manager
 from assistant.assistant_rag import create_assistant, load_pdf_and_create_vectorstore
 from ui_utils import create_styled_label, create_tooltip, get_theme
+from log_config import setup_logging
 
-logging.basicConfig(filename="app.log", level=logging.ERROR)
+logger = logging.getLogger(__name__)
+
+setup_logging()
 
 # Inisialisasi window dengan tema dari ui_utils.py
 window = ttkb.Window(themename=get_theme())
@@ -68,7 +71,7 @@ def open_recap_zabbix():
     try:
         recap_zabbix.setup_recap_frame(frame_recap, operator_name, kembali_pilihan)
     except ImportError as e:
-        logging.error(f"Gagal mengimpor recap_zabbix: {str(e)}")
+        logger.error(f"Gagal mengimpor recap_zabbix: {str(e)}")
         messagebox.showerror("Error", f"Gagal membuka Recap Zabbix: {str(e)}")
 
 def open_report_email():
@@ -77,7 +80,7 @@ def open_report_email():
     try:
         report_email.setup_email_frame(frame_email, operator_name, kembali_pilihan)
     except ImportError as e:
-        logging.error(f"Gagal mengimpor report_email: {str(e)}")
+        logger.error(f"Gagal mengimpor report_email: {str(e)}")
         messagebox.showerror("Error", f"Gagal membuka Report Email: {str(e)}")
 
 def open_assistant():
@@ -89,7 +92,7 @@ def open_assistant():
     try:
         qa = create_assistant()
     except Exception as e:
-        logging.error(f"Gagal menginisialisasi asisten: {str(e)}")
+        logger.error(f"Gagal menginisialisasi asisten: {str(e)}")
         messagebox.showerror("Error", f"Gagal menginisialisasi asisten: {str(e)}")
         kembali_pilihan()
         return
@@ -161,7 +164,7 @@ def open_assistant():
             status_label.config(text="✅ Pertanyaan berhasil diproses", fg="green")
         except Exception as e:
             status_label.config(text=f"❌ Gagal memproses pertanyaan: {str(e)}", fg="red")
-            logging.error(f"Error saat memproses pertanyaan: {str(e)}")
+            logger.error(f"Error saat memproses pertanyaan: {str(e)}")
         finally:
             progress.stop()
             progress.grid_forget()
@@ -179,7 +182,7 @@ def open_assistant():
             status_label.config(text="✅ Vectorstore berhasil dimuat ulang", fg="green")
         except Exception as e:
             status_label.config(text=f"❌ Gagal memuat ulang vectorstore: {str(e)}", fg="red")
-            logging.error(f"Error saat memuat ulang vectorstore: {str(e)}")
+            logger.error(f"Error saat memuat ulang vectorstore: {str(e)}")
         finally:
             progress.stop()
             progress.grid_forget()
@@ -206,7 +209,7 @@ def open_memo_manager():
     try:
         memo_manager.setup_memo_frame(frame_memo, operator_name, kembali_pilihan)
     except ImportError as e:
-        logging.error(f"Gagal mengimpor memo_manager: {str(e)}")
+        logger.error(f"Gagal mengimpor memo_manager: {str(e)}")
         messagebox.showerror("Error", f"Gagal membuka Memo Manager: {str(e)}")
 
 # --- Widget untuk Login ---
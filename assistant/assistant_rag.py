@@ -12,15 +12,18 @@ import logging
 import sys
 sys.path.append("c:/ARMIN")
 from ui_utils import get_theme, create_styled_label, create_tooltip
+from log_config import setup_logging
 
-logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+setup_logging()
 
 DB_FAISS_PATH = "assistant/data/db_faiss"
 PDF_PATH = "assistant/data/knowledge.pdf"
 
 def load_pdf_and_create_vectorstore():
     if not os.path.exists(PDF_PATH):
-        logging.error(f"PDF file not found: {PDF_PATH}")
+        logger.error(f"PDF file not found: {PDF_PATH}")
         raise FileNotFoundError(f"PDF file not found: {PDF_PATH}")
 
     loader = PyPDFLoader(PDF_PATH)
@@ -28,12 +31,12 @@ def load_pdf_and_create_vectorstore():
     embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
     db = FAISS.from_documents(documents, embeddings)
     db.save_local(DB_FAISS_PATH)
-    logging.info("Vektor berhasil disimpan.")
+    logger.info("Vektor berhasil disimpan.")
     return db
 
 def load_vectorstore():
     if not os.path.exists(DB_FAISS_PATH):
-        logging.error(f"FAISS database not found: {DB_FAISS_PATH}")
+        logger.error(f"FAISS database not found: {DB_FAISS_PATH}")
         raise FileNotFoundError(f"FAISS database not found: {DB_FAISS_PATH}")
 
     embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
@@ -41,10 +44,10 @@ def load_vectorstore():
 
 def create_assistant():
     if not os.path.exists(DB_FAISS_PATH):
-        logging.info("Membuat vectorstore baru dari PDF...")
+        logger.info("Membuat vectorstore baru dari PDF...")
         retriever = load_pdf_and_create_vectorstore().as_retriever()
     else:
-        logging.info("Memuat vectorstore yang sudah ada...")
+        logger.info("Memuat vectorstore yang sudah ada...")
         retriever = load_vectorstore().as_retriever()
 
     llm = OllamaLLM(model="gemma:2b")
@@ -80,7 +83,7 @@ Jawaban:
                 jawaban = llm.invoke(pertanyaan)
             return jawaban
         except Exception as e:
-            logging.error(f"Error saat memproses pertanyaan: {str(e)}")
+            logger.error(f"Error saat memproses pertanyaan: {str(e)}")
             return f"Gagal memproses pertanyaan: {str(e)}"
 
     return tanya
@@ -93,7 +96,7 @@ def setup_assistant_frame(frame, operator_name, kembali_callback):
     try:
         tanya = create_assistant()
     except Exception as e:
-        logging.error(f"Gagal menginisialisasi asisten: {str(e)}")
+        logger.error(f"Gagal menginisialisasi asisten: {str(e)}")
         # Tampilkan pesan error dan kembali ke menu utama
         tk.messagebox.showerror("Error", f"Gagal menginisialisasi asisten: {str(e)}")
         kembali_callback()
@@ -168,7 +171,7 @@ def setup_assistant_frame(frame, operator_name, kembali_callback):
             text_jawaban.config(state="disabled")
         except Exception as e:
             tk.messagebox.showerror("Error", f"Gagal memproses pertanyaan: {str(e)}")
-            logging.error(f"Error saat memproses pertanyaan: {str(e)}")
+            logger.error(f"Error saat memproses pertanyaan: {str(e)}")
         finally:
             progress.stop()
             progress.grid_forget()
@@ -0,0 +1,113 @@
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Menjalankan pekerjaan berat (fetch API, baca CSV, analisis, build PDF) di luar thread Tk.
+# Hasil dan progres dibaca kembali oleh thread Tk lewat polling widget.after().
+
+JOB_POLL_MS = 100
+JOB_WORKERS = 1
+
+_executor = None
+
+def _get_executor():
+    """
+    Executor bersama. Satu worker: job diproses berurutan sehingga cache data/analisis di
+    recap_zabbix hanya disentuh satu thread pada satu waktu.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="recap-job")
+    return _executor
+
+class JobCancelled(Exception):
+    """
+    Dilempar di titik periksa job setelah tombol Cancel ditekan.
+    """
+
+class JobFailed(Exception):
+    """
+    Kegagalan yang sudah diketahui: args = (pesan untuk UI, pesan untuk log).
+    """
+
+class Job:
+    """
+    Status satu pekerjaan latar belakang: tahap, jumlah baris/langkah selesai, total, dan flag cancel.
+    Worker memanggil progress() yang sekaligus menjadi titik pembatalan.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.stage = "Menunggu antrian"
+        self.done = None
+        self.total = None
+        self.future = None
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+
+    def progress(self, stage, done=None, total=None):
+        self.check()
+        with self._lock:
+            self.stage, self.done, self.total = stage, done, total
+
+    def snapshot(self):
+        with self._lock:
+            return self.stage, self.done, self.total
+
+    def cancel(self):
+        self._cancelled.set()
+        logger.info(f"Job {self.name} cancelled")
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def check(self):
+        if self._cancelled.is_set():
+            raise JobCancelled(self.name)
+
+def run_in_background(widget, name, func, on_done, on_error, on_progress=None, on_cancel=None):
+    """
+    Menjalankan func(job) di executor lalu mem-polling hasilnya dengan widget.after().
+    Callback on_* selalu dipanggil di thread Tk. Setelah cancel, on_cancel langsung dipanggil dan
+    hasil job (yang mungkin masih menyelesaikan request yang sedang berjalan) dibuang.
+    """
+    job = Job(name)
+
+    def run():
+        job.check()
+        return func(job)
+
+    job.future = _get_executor().submit(run)
+    logger.info(f"Job {name} submitted")
+
+    def poll():
+        if not widget.winfo_exists():
+            # Frame sudah ditutup (mis. tombol Kembali): hentikan job, tidak ada yang perlu diperbarui
+            job.cancel()
+            return
+        if job.cancelled:
+            if on_cancel:
+                on_cancel(job)
+            return
+        if on_progress:
+            on_progress(job, *job.snapshot())
+        if not job.future.done():
+            widget.after(JOB_POLL_MS, poll)
+            return
+        try:
+            result = job.future.result()
+        except JobCancelled:
+            if on_cancel:
+                on_cancel(job)
+            return
+        except Exception as e:
+            on_error(job, e)
+            return
+        logger.info(f"Job {name} finished")
+        on_done(job, result)
+
+    widget.after(JOB_POLL_MS, poll)
+    return job
@@ -0,0 +1,162 @@
+import os
+import sys
+import time
+import logging
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+import recap_zabbix
+from csv_ingest import ingest_csv_files
+
+# Mode batch: memuat data sekali lalu membuat laporan teks + PDF untuk beberapa shift sekaligus,
+# satu proses pekerja per shift.
+#   python batch_recap.py --operator armin                       # API, shift A C M D
+#   python batch_recap.py --csv export1.csv export2.csv --date 2026-10-17
+#   python batch_recap.py --page-size 2000                      # API per halaman (memori dibatasi)
+
+DEFAULT_SHIFTS = ["A", "C", "M", "D"]
+DEFAULT_OUTPUT_DIR = "zabbix_recap"
+
+logger = logging.getLogger(__name__)
+
+def load_dataset(csv_files=None, page_size=None):
+    """
+    Memuat data sekali: dari CSV jika csv_files diisi, selain itu dari API Zabbix.
+    Dengan page_size (hanya API) mengembalikan generator DataFrame per halaman (iter_zabbix_data).
+    """
+    if csv_files:
+        return ingest_csv_files(csv_files)
+    if recap_zabbix.fetch_zabbix_data is None:
+        raise RuntimeError("zabbix_api.py not available")
+    if page_size:
+        return recap_zabbix.iter_zabbix_data(recap_zabbix.RECAP_SEVERITIES, page_size=page_size)
+    return recap_zabbix.fetch_zabbix_data(recap_zabbix.RECAP_SEVERITIES)
+
+def partition_by_shift(df, shifts, reference):
+    """
+    Memecah df menjadi baris per jendela shift memakai satu indeks waktu bersama.
+    """
+    parts = {}
+    for shift in shifts:
+        window = recap_zabbix.get_shift_window(shift, reference)
+        parts[shift] = recap_zabbix.select_shift_rows(df, *window) if window else df
+    return parts
+
+def partition_stream(chunks, shifts, reference):
+    """
+    Seperti partition_by_shift untuk potongan data yang datang bertahap: setiap potongan langsung
+    dipecah per jendela shift, sehingga data lengkap tidak pernah digabung. Mengembalikan
+    (dict shift -> list potongan baris, jumlah baris yang dibaca).
+    """
+    parts = {shift: [] for shift in shifts}
+    total = 0
+    for chunk in chunks:
+        total += len(chunk)
+        for shift, rows in partition_by_shift(chunk, shifts, reference).items():
+            if len(rows):
+                parts[shift].append(rows)
+    logger.info(f"Partitioned {total} streamed rows into {len(shifts)} shifts")
+    return parts, total
+
+def row_count(rows):
+    return len(rows) if isinstance(rows, pd.DataFrame) else sum(len(chunk) for chunk in rows)
+
+def report_paths(output_dir, shift, period_date):
+    base = os.path.join(output_dir, f"Zabbix_Report_{shift}_{period_date}")
+    return f"{base}.txt", f"{base}.pdf"
+
+def render_shift(shift, rows, operator_name, reference, output_dir):
+    """
+    Dijalankan di proses pekerja: analisis satu shift (rows sudah dipilih per jendela oleh
+    partition_by_shift, atau list potongan dari partition_stream) lalu tulis laporan teks dan PDF.
+    Mengembalikan (shift, path txt, path pdf, jumlah baris, detik) atau path None jika tidak ada data.
+    """
+    start = time.perf_counter()
+    report, problem_groups = recap_zabbix.analyze_data(
+        rows, shift, operator_name, reference=reference, save_artifacts=False, window_filtered=True
+    )
+    if not report:
+        return shift, None, None, row_count(rows), time.perf_counter() - start
+    period_date = recap_zabbix.get_period_date(shift, None, reference)
+    txt_path, pdf_path = report_paths(output_dir, shift, period_date)
+    with open(txt_path, "w", encoding="utf-8") as f:
+        f.write(report)
+    recap_zabbix.render_pdf(problem_groups, shift, operator_name, period_date, pdf_path)
+    return shift, txt_path, pdf_path, row_count(rows), time.perf_counter() - start
+
+def run_batch(df, shifts, operator_name, reference=None, output_dir=DEFAULT_OUTPUT_DIR, workers=None):
+    """
+    Membuat laporan untuk semua shift secara paralel. df boleh berupa DataFrame atau iterable
+    potongan DataFrame (lihat partition_stream). Mengembalikan dict shift -> hasil render_shift.
+    """
+    reference = reference or datetime.now()
+    if isinstance(df, pd.DataFrame):
+        parts = partition_by_shift(df, shifts, reference)
+    else:
+        parts, _ = partition_stream(df, shifts, reference)
+    return run_partitions(parts, operator_name, reference, output_dir, workers)
+
+def run_partitions(parts, operator_name, reference, output_dir=DEFAULT_OUTPUT_DIR, workers=None):
+    """
+    Menjalankan render_shift untuk setiap shift di parts (dict shift -> baris), satu proses per shift.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    workers = min(len(parts), workers or os.cpu_count() or 1)
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(render_shift, shift, rows, operator_name, reference, output_dir)
+            for shift, rows in parts.items()
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result[0]] = result
+            logger.info(f"Batch shift {result[0]}: {result[3]} rows in {result[4]:.2f}s -> {result[2]}")
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Buat rekap Zabbix untuk beberapa shift sekaligus")
+    parser.add_argument("--csv", nargs="+", help="file CSV export Zabbix (default: ambil dari API)")
+    parser.add_argument("--shifts", nargs="+", default=DEFAULT_SHIFTS, choices=DEFAULT_SHIFTS)
+    parser.add_argument("--operator", default="batch")
+    parser.add_argument("--date", help="tanggal rekap YYYY-MM-DD (default: shift terakhir sampai sekarang)")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--page-size", type=int, help="ambil data API per halaman sebanyak N problem")
+    args = parser.parse_args(argv)
+
+    # Dengan --date, setiap shift adalah yang dimulai pada tanggal tersebut (M berakhir esok paginya)
+    reference = recap_zabbix.parse_reference_date(args.date) or datetime.now()
+
+    start = time.perf_counter()
+    df = load_dataset(args.csv, args.page_size)
+    if isinstance(df, pd.DataFrame) or df is None:
+        if df is None or df.empty:
+            print("Tidak ada data untuk direkap")
+            return 1
+        parts, rows = partition_by_shift(df, args.shifts, reference), len(df)
+    else:
+        # Halaman API dipecah per shift saat tiba; pekerja menerima list potongan per shift
+        try:
+            parts, rows = partition_stream(df, args.shifts, reference)
+        except RuntimeError as e:
+            logger.error(f"Failed to stream problems from API: {e}")
+            rows = 0
+        if not rows:
+            print("Tidak ada data untuk direkap")
+            return 1
+    loaded = time.perf_counter() - start
+    results = run_partitions(parts, args.operator, reference, args.output_dir, args.workers)
+    print(f"Data: {rows} baris dimuat dalam {loaded:.2f}s")
+    for shift in args.shifts:
+        _, txt_path, pdf_path, rows, elapsed = results[shift]
+        outputs = f"{txt_path}, {pdf_path}" if pdf_path else "tidak ada data yang memenuhi kriteria"
+        print(f"Shift {shift}: {rows} baris, {elapsed:.2f}s -> {outputs}")
+    print(f"Total: {time.perf_counter() - start:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+from mock_zabbix_server import MockZabbixServer, generate_problems
+
+# Benchmark jalur fetch -> analyze -> render terhadap server Zabbix tiruan lokal.
+#   python benchmark_recap.py --sizes 100 1000 10000 50000 --latency 0.02
+
+DEFAULT_SIZES = [100, 1000, 10000, 50000]
+DEFAULT_PDF_ROWS = [1000, 10000, 50000]
+ALL_SEVERITIES = range(0, 6)
+
+def run_once(zabbix_api, recap_zabbix, count, latency, shift, workdir, trace_memory):
+    """
+    Menjalankan satu putaran end-to-end untuk count problem; mengembalikan dict hasil ukur.
+    """
+    mock = MockZabbixServer(generate_problems(count), latency=latency).start()
+    try:
+        zabbix_api.ZABBIX_URL = mock.url
+        zabbix_api.close_session()
+        zabbix_api.reset_api_stats()
+        zabbix_api.reset_problem_snapshot()
+        zabbix_api.get_metadata_cache().invalidate()
+        if trace_memory:
+            tracemalloc.start()
+
+        timings = {}
+        start = time.perf_counter()
+        df = zabbix_api.fetch_zabbix_data(ALL_SEVERITIES)
+        timings["fetch"] = time.perf_counter() - start
+        if df is None:
+            raise RuntimeError(f"fetch_zabbix_data returned no data for {count} problems")
+
+        start = time.perf_counter()
+        # Tanpa history/snapshot agar yang diukur hanya analisis
+        report, problem_groups = recap_zabbix.analyze_data(df, shift, "benchmark", save_artifacts=False)
+        timings["analyze"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        recap_zabbix.render_pdf(problem_groups, shift, "benchmark", recap_zabbix.get_period_date(shift, df.iloc[0]["Time"]),
+                                os.path.join(workdir, f"bench_{count}.pdf"))
+        timings["render"] = time.perf_counter() - start
+
+        peak = None
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        return {
+            "problems": count,
+            "rows": len(df),
+            **timings,
+            "total": sum(timings.values()),
+            "api_calls": sum(s["calls"] for s in zabbix_api.get_api_stats().values()),
+            "http_requests": mock.request_count,
+            "peak_mb": peak / (1024 * 1024) if peak is not None else None,
+        }
+    finally:
+        mock.stop()
+
+def synthetic_groups(recap_zabbix, rows, categories=5):
+    """
+    problem_groups sintetis dengan total `rows` baris; kategori pertama berisi separuhnya.
+    """
+    groups = {}
+    for c in range(categories):
+        size = rows // 2 if c == 0 else rows // (2 * (categories - 1))
+        group = recap_zabbix.RecapGroup()
+        group.hosts = [f"host-{i:05d}" for i in range(size)]
+        group.durations = [(i % 30) * 86400 + (i % 24) * 3600 + (i % 60) * 60 for i in range(size)]
+        group.starts = ["18/10/2026 07:00"] * size
+        group.ticket_ids = [f"IFG-{1000 + i % 9000}" for i in range(size)]
+        group.statuses = ["Belum Resolved" if i % 3 else "Resolved" for i in range(size)]
+        groups[f"Problem category {c}"] = group
+    return groups
+
+def run_pdf_once(recap_zabbix, rows, trace_memory):
+    """
+    Mengukur render_pdf ke buffer memori untuk `rows` baris.
+    """
+    groups = synthetic_groups(recap_zabbix, rows)
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    buffer = recap_zabbix.render_pdf(groups, "D", "benchmark", "2026-10-18")
+    elapsed = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {
+        "rows": rows,
+        "render": elapsed,
+        "pdf_kb": len(buffer.getvalue()) / 1024,
+        "peak_mb": peak / (1024 * 1024) if peak is not None else None,
+    }
+
+def format_row(result):
+    peak = f"{result['peak_mb']:.1f}" if result["peak_mb"] is not None else "-"
+    return (f"{result['problems']:>8} {result['rows']:>8} {result['fetch']:>9.3f} {result['analyze']:>9.3f} "
+            f"{result['render']:>9.3f} {result['total']:>9.3f} {result['api_calls']:>9} "
+            f"{result['http_requests']:>9} {peak:>9}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark fetch/analyze/render rekap Zabbix")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--latency", type=float, default=0.02, help="latensi per request (detik)")
+    parser.add_argument("--shift", default="D")
+    parser.add_argument("--no-memory", action="store_true", help="matikan tracemalloc (lebih cepat)")
+    parser.add_argument("--pdf-rows", type=int, nargs="*",
+                        help=f"hanya ukur render PDF untuk jumlah baris ini (default {DEFAULT_PDF_ROWS})")
+    args = parser.parse_args(argv)
+
+    # Modul aplikasi menulis log dan file hasil ke direktori kerja, jadi jalankan di folder sementara.
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    workdir = tempfile.mkdtemp(prefix="recap_bench_")
+    os.chdir(workdir)
+    import zabbix_api
+    import recap_zabbix
+    zabbix_api.METADATA_CACHE_FILE = None
+
+    if args.pdf_rows is not None:
+        print(f"{'rows':>8} {'render_s':>9} {'pdf_kb':>9} {'peak_mb':>9}")
+        for rows in args.pdf_rows or DEFAULT_PDF_ROWS:
+            result = run_pdf_once(recap_zabbix, rows, not args.no_memory)
+            peak = f"{result['peak_mb']:.1f}" if result["peak_mb"] is not None else "-"
+            print(f"{result['rows']:>8} {result['render']:>9.3f} {result['pdf_kb']:>9.0f} {peak:>9}", flush=True)
+        return
+
+    print(f"Workdir: {workdir}, latency: {args.latency}s")
+    print(f"{'problems':>8} {'rows':>8} {'fetch_s':>9} {'analyze_s':>9} {'render_s':>9} {'total_s':>9} "
+          f"{'api_calls':>9} {'http_req':>9} {'peak_mb':>9}")
+    for count in args.sizes:
+        result = run_once(zabbix_api, recap_zabbix, count, args.latency, args.shift, workdir, not args.no_memory)
+        print(format_row(result), flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import os
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from frame_cache import FrameCache
+
+logger = logging.getLogger(__name__)
+
+# Ingest CSV export Zabbix untuk rekap: hanya kolom yang dipakai, dtype ringkas, beberapa file
+# di-parse paralel. Dipakai thread, bukan proses: tokenizer parser C pandas dan engine pyarrow
+# melepas GIL sehingga tetap memakai banyak core, dan app.py (tanpa guard __main__) tidak aman
+# di-spawn ulang oleh ProcessPoolExecutor di Windows.
+
+REQUIRED_COLUMNS = ["Host", "Time", "Status", "Duration", "Problem", "Tags"]
+OPTIONAL_COLUMNS = ["EventID"]
+# Kolom yang nilainya sangat berulang disimpan sebagai kategori; kolom lain memakai dtype default
+CATEGORY_COLUMNS = ["Host", "Status", "Problem"]
+
+# Di bawah ukuran total ini file dibaca berurutan; overhead paralel lebih mahal dari parsing
+CSV_PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+CSV_MAX_WORKERS = os.cpu_count() or 1
+
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = "c"
+
+# Cache hasil parsing per isi file (hash), agar unggah ulang file yang sama tidak di-parse lagi.
+# Naikkan CSV_CACHE_VERSION jika kolom/dtype hasil ingest berubah.
+CSV_CACHE_ENABLED = True
+CSV_CACHE_DIR = "csv_cache"
+CSV_CACHE_MAX_BYTES = 512 * 1024 * 1024
+CSV_CACHE_VERSION = 1
+HASH_BLOCK_SIZE = 1024 * 1024
+
+_csv_cache = None
+_engine_warned = False
+# Hash terakhir per (path, mtime, ukuran) agar file yang tidak berubah tidak di-hash ulang
+_hash_memo = {}
+
+class CsvSchemaError(ValueError):
+    """
+    Kolom wajib tidak ada di header file CSV.
+    """
+
+    def __init__(self, path, missing):
+        super().__init__(f"Missing columns in CSV {path}: {missing}")
+        self.path = path
+        self.missing = missing
+
+def read_header(path):
+    """
+    Membaca baris header saja dan memetakan nama kolom ter-strip ke nama aslinya.
+    Melempar CsvSchemaError jika ada kolom wajib yang hilang.
+    """
+    header = pd.read_csv(path, nrows=0, encoding="utf-8").columns
+    columns = {str(col).strip(): col for col in header}
+    missing = set(REQUIRED_COLUMNS) - set(columns)
+    if missing:
+        raise CsvSchemaError(path, missing)
+    return columns
+
+def read_csv_file(path, columns=None):
+    """
+    Parse satu file: hanya kolom wajib (+ EventID jika ada), CATEGORY_COLUMNS sebagai category.
+    """
+    columns = columns or read_header(path)
+    wanted = {columns[col]: col for col in REQUIRED_COLUMNS + OPTIONAL_COLUMNS if col in columns}
+    df = pd.read_csv(
+        path,
+        usecols=list(wanted),
+        dtype={original: "category" for original, col in wanted.items() if col in CATEGORY_COLUMNS},
+        encoding="utf-8",
+        engine=CSV_ENGINE
+    )
+    return df.rename(columns=wanted)[list(wanted.values())]
+
+def get_csv_cache():
+    global _csv_cache
+    if _csv_cache is None:
+        _csv_cache = FrameCache(CSV_CACHE_DIR, CSV_CACHE_MAX_BYTES, enabled=CSV_CACHE_ENABLED)
+    _csv_cache.enabled = CSV_CACHE_ENABLED
+    return _csv_cache
+
+def content_hash(path):
+    """
+    Kunci cache dari isi file (blake2b) ditambah versi skema ingest.
+    """
+    stat = os.stat(path)
+    signature = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    digest = _hash_memo.get(signature)
+    if digest is None:
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        _hash_memo[signature] = digest
+    return f"v{CSV_CACHE_VERSION}-{digest}"
+
+def load_csv_file(path, columns=None):
+    """
+    read_csv_file dengan cache kolumnar: hasil parsing disimpan per hash isi file.
+    """
+    cache = get_csv_cache()
+    if not cache.enabled:
+        return read_csv_file(path, columns)
+    key = content_hash(path)
+    df = cache.get(key)
+    if df is not None:
+        logger.info(f"Loaded {path} from CSV cache ({len(df)} rows)")
+        return df
+    df = read_csv_file(path, columns)
+    cache.put(key, df)
+    return df
+
+def combine_frames(frames):
+    """
+    Menggabungkan hasil per file; kategori disatukan agar kolom tetap categorical.
+    """
+    if len(frames) == 1:
+        return frames[0]
+    categories = {
+        col: union_categoricals([f[col] for f in frames], ignore_order=True)
+        for col in CATEGORY_COLUMNS
+    }
+    df = pd.concat([f.drop(columns=CATEGORY_COLUMNS) for f in frames], ignore_index=True)
+    for col, values in categories.items():
+        df[col] = pd.Categorical(values)
+    return df[list(dict.fromkeys(col for f in frames for col in f.columns))]
+
+def ingest_csv_files(paths, progress=None, max_workers=None):
+    """
+    Membaca beberapa file CSV menjadi satu DataFrame. Semua header diperiksa lebih dulu
+    (gagal cepat sebelum parsing penuh), lalu file di-parse paralel jika cukup besar.
+    progress(stage, done, total) dipanggil per file selesai.
+    """
+    global _engine_warned
+    if CSV_ENGINE != "pyarrow" and not _engine_warned:
+        logger.warning("pyarrow not installed: CSV files are parsed with the slower C engine; install requirement.txt")
+        _engine_warned = True
+    headers = [read_header(path) for path in paths]
+    total_bytes = sum(os.path.getsize(path) for path in paths)
+    workers = min(len(paths), max_workers or CSV_MAX_WORKERS)
+    frames = [None] * len(paths)
+
+    if workers > 1 and total_bytes >= CSV_PARALLEL_MIN_BYTES:
+        logger.info(f"Reading {len(paths)} CSV files ({total_bytes} bytes) with {workers} threads, engine={CSV_ENGINE}")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="csv-ingest") as executor:
+            futures = {executor.submit(load_csv_file, path, header): i for i, (path, header) in enumerate(zip(paths, headers))}
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    frames[futures[future]] = future.result()
+                    if progress:
+                        progress("Membaca file CSV", done, len(paths))
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+    else:
+        logger.info(f"Reading {len(paths)} CSV files ({total_bytes} bytes) sequentially, engine={CSV_ENGINE}")
+        for i, (path, header) in enumerate(zip(paths, headers)):
+            frames[i] = load_csv_file(path, header)
+            if progress:
+                progress("Membaca file CSV", i + 1, len(paths))
+
+    df = combine_frames(frames)
+    logger.info(f"Combined {len(frames)} CSV files into DataFrame with {len(df)} rows")
+    return df
@@ -0,0 +1,146 @@
+import os
+import logging
+import threading
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow  # noqa: F401
+    FRAME_CACHE_FORMAT = "feather"
+except ImportError:
+    FRAME_CACHE_FORMAT = "pickle"
+
+class FrameCache:
+    """
+    Cache DataFrame di disk, satu file per kunci (mis. hash isi file CSV).
+    Format Feather (Arrow IPC, kolumnar, bisa di-memory-map) jika pyarrow tersedia, selain itu
+    pickle pandas. Ukuran total dibatasi max_bytes; file yang paling lama tidak dipakai dihapus dulu.
+    """
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024, enabled=True, memory_map=True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.memory_map = memory_map
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        if enabled and FRAME_CACHE_FORMAT != "feather":
+            logger.warning(
+                f"pyarrow not installed: frame cache {directory} falls back to pickle "
+                "(no columnar reads or memory-map); install requirement.txt"
+            )
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.{FRAME_CACHE_FORMAT}")
+
+    def get(self, key):
+        """
+        Memuat DataFrame untuk key, atau None jika tidak ada/rusak/cache dimatikan.
+        """
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            if FRAME_CACHE_FORMAT == "feather":
+                df = pd.read_feather(path, memory_map=self.memory_map)
+            else:
+                df = pd.read_pickle(path)
+            os.utime(path)  # tanda dipakai untuk urutan eviction
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except Exception as e:
+            logger.error(f"Failed to load cached frame {path}: {e}")
+            self.invalidate(key)
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        logger.debug(f"Loaded cached frame {path} ({len(df)} rows)")
+        return df
+
+    def put(self, key, df):
+        """
+        Menyimpan df (atomik lewat file sementara) lalu menjalankan eviction.
+        """
+        if not self.enabled:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if FRAME_CACHE_FORMAT == "feather":
+                df.reset_index(drop=True).to_feather(tmp_path, compression="uncompressed")
+            else:
+                df.to_pickle(tmp_path, compression=None, protocol=5)
+            os.replace(tmp_path, path)
+            logger.debug(f"Cached frame {path} ({len(df)} rows)")
+        except Exception as e:
+            logger.error(f"Failed to cache frame {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.evict()
+
+    def invalidate(self, key=None):
+        """
+        Menghapus satu entri, atau seluruh isi cache jika key None.
+        """
+        paths = [self._path(key)] if key is not None else self._entries()
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        suffix = f".{FRAME_CACHE_FORMAT}"
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(suffix)]
+
+    def evict(self):
+        """
+        Menghapus entri paling lama tidak dipakai sampai total ukuran <= max_bytes.
+        """
+        with self._lock:
+            entries = []
+            for path in self._entries():
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logger.error(f"Failed to evict cached frame {path}: {e}")
+                    continue
+                total -= size
+                self.evictions += 1
+                logger.info(f"Evicted cached frame {path} ({size} bytes)")
+
+    def stats(self):
+        sizes = [os.path.getsize(path) for path in self._entries()]
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(sizes),
+                "bytes": sum(sizes),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+                "format": FRAME_CACHE_FORMAT,
+                "enabled": self.enabled
+            }
@@ -0,0 +1,182 @@
+import time
+import sqlite3
+import logging
+from contextlib import closing
+
+logger = logging.getLogger(__name__)
+
+# Riwayat problem hasil rekap di SQLite lokal. Setiap run meng-upsert problem berdasarkan EventID
+# (baris tanpa EventID memakai kunci "host|time|problem") dalam satu transaksi.
+# Data API hanya berisi problem aktif, sehingga problem yang resolved tidak pernah muncul lagi
+# untuk di-upsert; run dari API menandai problem PROBLEM yang hilang dari data sebagai RESOLVED
+# (lihat save_run). Run dari CSV memakai status dari export apa adanya.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS problems (
+    eventid TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    clock INTEGER,
+    problem TEXT,
+    problem_group TEXT,
+    status TEXT,
+    duration_s INTEGER,
+    ticket_id TEXT,
+    shift TEXT,
+    first_seen INTEGER NOT NULL,
+    last_seen INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_problems_host_clock ON problems (host, clock);
+CREATE INDEX IF NOT EXISTS idx_problems_clock ON problems (clock);
+CREATE INDEX IF NOT EXISTS idx_problems_group ON problems (problem_group);
+CREATE INDEX IF NOT EXISTS idx_problems_ticket ON problems (ticket_id);
+CREATE INDEX IF NOT EXISTS idx_problems_status_clock ON problems (status, clock);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created INTEGER NOT NULL,
+    shift TEXT,
+    operator TEXT,
+    problems INTEGER,
+    filtered INTEGER
+);
+CREATE TABLE IF NOT EXISTS filtered_problems (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    message TEXT
+);
+"""
+
+UPSERT_SQL = """
+INSERT INTO problems (eventid, host, clock, problem, problem_group, status, duration_s, ticket_id,
+                      shift, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (eventid) DO UPDATE SET
+    host = excluded.host,
+    clock = excluded.clock,
+    problem = excluded.problem,
+    problem_group = excluded.problem_group,
+    status = excluded.status,
+    duration_s = excluded.duration_s,
+    ticket_id = excluded.ticket_id,
+    shift = excluded.shift,
+    last_seen = excluded.last_seen
+"""
+
+class HistoryStore:
+    """
+    Penyimpanan riwayat problem. Koneksi dibuka per operasi sehingga aman dipakai dari thread
+    worker UI maupun proses batch.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._initialized = False
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if not self._initialized:
+            conn.executescript(SCHEMA)
+            self._initialized = True
+        return conn
+
+    def save_run(self, records, shift, operator_name, filtered=(), resolve_missing_before=None):
+        """
+        Upsert records (kolom eventid, host, clock, problem, group, zabbix_status, duration_s, ticket_id)
+        dan mencatat run beserta problem yang difilter, semuanya dalam satu transaksi.
+        Jika resolve_missing_before (epoch) diisi, records dianggap berisi semua problem yang masih
+        aktif: problem berstatus PROBLEM dengan clock <= resolve_missing_before yang tidak ada di
+        records ditandai RESOLVED. Mengembalikan run_id, atau None jika gagal.
+        """
+        now = int(time.time())
+        rows = [] if records is None else list(zip(
+            records["eventid"], records["host"], records["clock"], records["problem"], records["group"],
+            records["zabbix_status"], records["duration_s"], records["ticket_id"],
+            [shift] * len(records), [now] * len(records), [now] * len(records)
+        ))
+        start = time.perf_counter()
+        try:
+            with closing(self.connect()) as conn, conn:
+                conn.executemany(UPSERT_SQL, rows)
+                resolved = 0
+                if resolve_missing_before is not None:
+                    resolved = self._resolve_missing(conn, [row[0] for row in rows], resolve_missing_before, now)
+                run_id = conn.execute(
+                    "INSERT INTO runs (created, shift, operator, problems, filtered) VALUES (?, ?, ?, ?, ?)",
+                    (now, shift, operator_name, len(rows), len(filtered))
+                ).lastrowid
+                conn.executemany(
+                    "INSERT INTO filtered_problems (run_id, message) VALUES (?, ?)",
+                    ((run_id, message) for message in filtered)
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to save history to {self.path}: {e}")
+            return None
+        logger.info(
+            f"Saved {len(rows)} problems to history run {run_id} ({resolved} no longer active marked resolved) "
+            f"in {time.perf_counter() - start:.3f}s"
+        )
+        return run_id
+
+    @staticmethod
+    def _resolve_missing(conn, eventids, before, now):
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS run_eventids (eventid TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM run_eventids")
+        conn.executemany("INSERT OR IGNORE INTO run_eventids (eventid) VALUES (?)", ((e,) for e in eventids))
+        return conn.execute(
+            "UPDATE problems SET status = 'RESOLVED', last_seen = ? "
+            "WHERE status = 'PROBLEM' AND clock <= ? AND eventid NOT IN (SELECT eventid FROM run_eventids)",
+            (now, before)
+        ).rowcount
+
+    def query(self, host=None, since=None, until=None, status=None, group=None, ticket_id=None, limit=None):
+        """
+        Mencari problem berdasarkan host, rentang waktu mulai (datetime atau epoch), status
+        (PROBLEM/RESOLVED), kategori dan ticket; hasil berupa list dict terurut dari yang terbaru.
+        """
+        conditions, params = [], []
+        for column, value in (("host", host), ("status", status), ("problem_group", group), ("ticket_id", ticket_id)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            conditions.append("clock >= ?")
+            params.append(to_epoch(since))
+        if until is not None:
+            conditions.append("clock < ?")
+            params.append(to_epoch(until))
+        sql = "SELECT * FROM problems"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY clock DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        try:
+            with closing(self.connect()) as conn:
+                return [dict(row) for row in conn.execute(sql, params)]
+        except sqlite3.Error as e:
+            logger.error(f"History query failed: {e}")
+            return []
+
+    def problems_for_host(self, host, since=None, until=None):
+        return self.query(host=host, since=since, until=until)
+
+    def open_problems(self, since=None):
+        """
+        Problem yang masih open (status PROBLEM pada run terakhir yang memuatnya, atau belum
+        ditandai resolved oleh run API sesudahnya) sejak `since`.
+        """
+        return self.query(status="PROBLEM", since=since)
+
+    def filtered_problems(self, run_id):
+        try:
+            with closing(self.connect()) as conn:
+                return [row["message"] for row in conn.execute(
+                    "SELECT message FROM filtered_problems WHERE run_id = ?", (run_id,)
+                )]
+        except sqlite3.Error as e:
+            logger.error(f"History query failed: {e}")
+            return []
+
+def to_epoch(value):
+    return int(value.timestamp()) if hasattr(value, "timestamp") else int(value)
@@ -0,0 +1,142 @@
+import os
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+# Konfigurasi logging bersama untuk semua modul. Modul memakai logging.getLogger(__name__) lalu
+# memanggil setup_logging(); hanya panggilan pertama yang memasang handler. Record dikirim ke
+# antrian (QueueHandler) dan ditulis ke file oleh thread QueueListener, sehingga thread UI dan
+# loop analisis tidak menunggu I/O file.
+#
+# Level per modul bisa diubah lewat environment, mis.:
+#   LOG_LEVEL=WARNING LOG_LEVELS="recap_zabbix=DEBUG,zabbix_api=INFO" python app.py
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+# Level root (termasuk library pihak ketiga) dan level per modul aplikasi
+LOG_LEVEL = "WARNING"
+LOG_LEVELS = {
+    "__main__": "INFO",
+    "app": "INFO",
+    "report_email": "INFO",
+    "assistant": "INFO",
+    "metadata_cache": "INFO",
+    "csv_ingest": "INFO",
+    "frame_cache": "INFO",
+    "problem_grouping": "INFO",
+    "background_job": "INFO",
+    "history_store": "INFO",
+    "shift_diff": "INFO",
+    "zabbix_api": "DEBUG",
+    "zabbix_async": "DEBUG",
+    "recap_zabbix": "DEBUG"
+}
+# File tujuan per awalan nama logger; logger lain ke LOG_DEFAULT_FILE
+LOG_FILES = {
+    "zabbix_api": "zabbix_api.log",
+    "zabbix_async": "zabbix_api.log",
+    "metadata_cache": "zabbix_api.log",
+    "recap_zabbix": "recap_zabbix.log",
+    "csv_ingest": "recap_zabbix.log",
+    "frame_cache": "recap_zabbix.log",
+    "problem_grouping": "recap_zabbix.log",
+    "background_job": "recap_zabbix.log",
+    "history_store": "recap_zabbix.log",
+    "shift_diff": "recap_zabbix.log"
+}
+LOG_DEFAULT_FILE = "app.log"
+# Log debug di jalur panas hanya ditulis sekali tiap LOG_SAMPLE_EVERY panggilan
+LOG_SAMPLE_EVERY = 1000
+
+_listener = None
+_setup_lock = threading.Lock()
+_sample_counts = {}
+
+class RoutingFileHandler(logging.Handler):
+    """
+    Menulis record ke file sesuai awalan nama logger (LOG_FILES); file dibuka saat pertama dipakai.
+    """
+
+    def __init__(self, routes, default_file, formatter):
+        super().__init__()
+        self.routes = routes
+        self.default_file = default_file
+        self.setFormatter(formatter)
+        self._handlers = {}
+
+    def _file_for(self, name):
+        prefix = name.split(".", 1)[0]
+        return self.routes.get(prefix, self.default_file)
+
+    def emit(self, record):
+        path = self._file_for(record.name)
+        handler = self._handlers.get(path)
+        if handler is None:
+            handler = logging.FileHandler(path, encoding="utf-8", delay=True)
+            handler.setFormatter(self.formatter)
+            self._handlers[path] = handler
+        handler.emit(record)
+
+    def close(self):
+        for handler in self._handlers.values():
+            handler.close()
+        super().close()
+
+def parse_levels(text):
+    """
+    "modul=LEVEL,modul2=LEVEL" -> {"modul": "LEVEL", ...}
+    """
+    levels = {}
+    for item in (text or "").split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+def setup_logging(level=None, levels=None):
+    """
+    Memasang QueueHandler di root logger dan QueueListener dengan handler file. Aman dipanggil
+    berkali-kali; level per modul tetap diterapkan ulang.
+    """
+    global _listener
+    with _setup_lock:
+        root = logging.getLogger()
+        root.setLevel(level or os.getenv("LOG_LEVEL", LOG_LEVEL))
+        module_levels = {**LOG_LEVELS, **(levels or {}), **parse_levels(os.getenv("LOG_LEVELS"))}
+        for name, module_level in module_levels.items():
+            logging.getLogger(name).setLevel(module_level)
+        if _listener is not None:
+            return
+
+        log_queue = queue.SimpleQueue()
+        handler = RoutingFileHandler(LOG_FILES, LOG_DEFAULT_FILE, logging.Formatter(LOG_FORMAT))
+        _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+        root.addHandler(QueueHandler(log_queue))
+        atexit.register(shutdown_logging)
+
+def shutdown_logging():
+    """
+    Menghentikan listener setelah semua record di antrian ditulis.
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+
+def sampled_debug(logger, key, msg, *args, every=None):
+    """
+    logger.debug(msg, *args) untuk jalur panas: format lazy (%-style) dan hanya satu dari
+    setiap `every` panggilan per key yang benar-benar dicatat.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    every = every or LOG_SAMPLE_EVERY
+    count = _sample_counts.get(key, 0)
+    _sample_counts[key] = count + 1
+    if count % every == 0:
+        logger.debug(f"{msg} [sampled 1/{every}, call {count + 1}]", *args)
@@ -0,0 +1,147 @@
+import os
+import json
+import time
+import threading
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class MetadataCache:
+    """
+    Cache LRU dengan TTL untuk metadata Zabbix (host, trigger) yang jarang berubah.
+    Kunci berupa (namespace, id), mis. ("event", "1234") atau ("trigger", "5678").
+    Jika path diisi, isi cache bisa disimpan/dimuat dari file JSON agar aplikasi langsung hangat.
+    """
+
+    def __init__(self, ttl=3600, max_size=50000, path=None):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    def get(self, namespace, key, default=None):
+        """
+        Mengambil nilai dari cache; entri yang kedaluwarsa dianggap miss dan dihapus.
+        """
+        k = (namespace, str(key))
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(k)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._data[k]
+                self.misses += 1
+                return default
+            self._data.move_to_end(k)
+            self.hits += 1
+            return entry[0]
+
+    def get_many(self, namespace, keys):
+        """
+        Mengembalikan (dict hit {key: value}, list key yang miss).
+        """
+        found, missing = {}, []
+        for key in keys:
+            value = self.get(namespace, key)
+            if value is None:
+                missing.append(str(key))
+            else:
+                found[str(key)] = value
+        return found, missing
+
+    def set(self, namespace, key, value, ttl=None):
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+        k = (namespace, str(key))
+        with self._lock:
+            self._data[k] = (value, expires)
+            self._data.move_to_end(k)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            self._dirty = True
+
+    def set_many(self, namespace, items, ttl=None):
+        for key, value in items.items():
+            self.set(namespace, key, value, ttl)
+
+    def invalidate(self, namespace=None, key=None):
+        """
+        Menghapus satu entri, satu namespace, atau seluruh cache.
+        """
+        with self._lock:
+            if namespace is None:
+                self._data.clear()
+            elif key is not None:
+                self._data.pop((namespace, str(key)), None)
+            else:
+                for k in [k for k in self._data if k[0] == namespace]:
+                    del self._data[k]
+            self._dirty = True
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+
+    def load(self):
+        """
+        Memuat entri yang belum kedaluwarsa dari file; file atau entri yang rusak diabaikan.
+        """
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load metadata cache {self.path}: {e}")
+            return 0
+        now = time.time()
+        loaded = skipped = 0
+        with self._lock:
+            for entry in entries if isinstance(entries, list) else []:
+                try:
+                    namespace, key, value, expires = entry
+                    if float(expires) > now:
+                        self._data[(namespace, key)] = (value, float(expires))
+                        loaded += 1
+                except (TypeError, ValueError):
+                    skipped += 1
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+        if skipped:
+            logger.warning(f"Skipped {skipped} malformed metadata cache entries in {self.path}")
+        logger.info(f"Loaded {loaded} metadata cache entries from {self.path}")
+        return loaded
+
+    def save(self):
+        """
+        Menyimpan cache ke file (atomik lewat file sementara) jika ada perubahan.
+        """
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            now = time.time()
+            entries = [[k[0], k[1], v, exp] for k, (v, exp) in self._data.items() if exp > now]
+            self._dirty = False
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+            logger.debug(f"Saved {len(entries)} metadata cache entries to {self.path}")
+        except OSError as e:
+            logger.error(f"Failed to save metadata cache {self.path}: {e}")
@@ -0,0 +1,218 @@
+import json
+import time
+import random
+import argparse
+import threading
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Server JSON-RPC tiruan Zabbix untuk pengujian lokal dan benchmark (problem.get, event.get, batch).
+
+HOST_PREFIXES = ["WIN-FS", "WIN-APP", "srv-db", "srv-web", "sw-core", "rtr-edge", "fw-dc"]
+PROBLEM_TEMPLATES = [
+    "Windows: FS [{drive}:]: Space is critically low (used > 90%)",
+    "Space is critically low on /{mount} (used > 95%)",
+    "Linux: High CPU utilization (over 90% for 5m)",
+    "Linux: High memory utilization (>90% for 5m)",
+    "Interface Gi0/{port}: Link down",
+    "subslot 0/0 transceiver {port} Temperature high",
+    "Zabbix agent is not available (for 3m)",
+    "ICMP: Unavailable by ICMP ping",
+]
+SEVERITY_WEIGHTS = {2: 2, 3: 3, 4: 4, 5: 1}
+
+def generate_problems(count, seed=42, now=None, max_age=30 * 86400, first_eventid=100000):
+    """
+    Membuat count problem sintetis (eventid menaik sesuai clock) beserta host, tag dan acknowledge.
+    """
+    rng = random.Random(seed)
+    now = int(now or time.time())
+    host_count = max(1, count // 5)
+    hosts = [f"{rng.choice(HOST_PREFIXES)}-{i:03d}" for i in range(host_count)]
+    clocks = sorted(now - rng.randint(60, max_age) for _ in range(count))
+    severities = list(SEVERITY_WEIGHTS)
+    weights = list(SEVERITY_WEIGHTS.values())
+    problems = []
+    for i, clock in enumerate(clocks):
+        host_index = rng.randrange(host_count)
+        template_index = rng.randrange(len(PROBLEM_TEMPLATES))
+        name = PROBLEM_TEMPLATES[template_index].format(
+            drive=rng.choice("CDE"), mount=rng.choice(["var", "data", "opt"]), port=rng.randint(1, 48)
+        )
+        tags = [{"tag": "scope", "value": rng.choice(["availability", "capacity", "performance"])}]
+        if rng.random() < 0.6:
+            tags.insert(0, {"tag": "__zbx_jira_issuekey", "value": f"IFG-{rng.randint(1000, 9999)}"})
+        acknowledges = []
+        if rng.random() < 0.3:
+            acknowledges.append({"message": rng.choice(["Sedang dicek", "Eskalasi ke tim infra", "Menunggu vendor"]),
+                                 "clock": str(clock + rng.randint(60, 3600))})
+        problems.append({
+            "eventid": str(first_eventid + i),
+            "objectid": str(20000 + host_index * len(PROBLEM_TEMPLATES) + template_index),
+            "name": name,
+            "severity": str(rng.choices(severities, weights)[0]),
+            "clock": str(clock),
+            "host": hosts[host_index],
+            "tags": tags,
+            "acknowledges": acknowledges,
+        })
+    return problems
+
+class MockZabbixServer:
+    """
+    Server HTTP lokal yang meniru endpoint api_jsonrpc.php Zabbix.
+    latency (detik) ditambahkan ke setiap POST untuk mensimulasikan jaringan WAN.
+    """
+
+    def __init__(self, problems=None, latency=0.0, host="127.0.0.1", port=0):
+        self.problems = {p["eventid"]: p for p in (problems or [])}
+        self.recoveries = []
+        self.latency = latency
+        self.request_count = 0
+        self.method_counts = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api_jsonrpc.php"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def add_problems(self, problems):
+        with self._lock:
+            for p in problems:
+                self.problems[p["eventid"]] = p
+
+    def resolve(self, eventid, clock=None):
+        """
+        Menutup problem dan mencatat event recovery untuk trigger-nya.
+        """
+        with self._lock:
+            p = self.problems.pop(str(eventid), None)
+            if p is not None:
+                self.recoveries.append({"objectid": p["objectid"], "clock": int(clock or time.time())})
+
+    def reset_counts(self):
+        with self._lock:
+            self.request_count = 0
+            self.method_counts = {}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                if server.latency:
+                    time.sleep(server.latency)
+                with server._lock:
+                    server.request_count += 1
+                if isinstance(body, list):
+                    response = [server.dispatch(req) for req in body]
+                else:
+                    response = server.dispatch(body)
+                out = json.dumps(response).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(out)))
+                self.end_headers()
+                self.wfile.write(out)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def dispatch(self, request):
+        method = request.get("method")
+        params = request.get("params", {})
+        with self._lock:
+            self.method_counts[method] = self.method_counts.get(method, 0) + 1
+            handler = {"problem.get": self._problem_get, "event.get": self._event_get}.get(method)
+            if handler is None:
+                return {"jsonrpc": "2.0", "error": {"code": -32601, "message": "Method not found.",
+                                                    "data": f'Incorrect method "{method}".'},
+                        "id": request.get("id")}
+            return {"jsonrpc": "2.0", "result": handler(params), "id": request.get("id")}
+
+    def _problem_get(self, params):
+        items = self.problems.values()
+        if "eventids" in params:
+            wanted = set(map(str, params["eventids"] if isinstance(params["eventids"], list) else [params["eventids"]]))
+            items = [p for p in items if p["eventid"] in wanted]
+        severity = params.get("filter", {}).get("severity")
+        if severity is not None:
+            wanted = set(map(str, severity if isinstance(severity, list) else [severity]))
+            items = [p for p in items if p["severity"] in wanted]
+        if "time_from" in params:
+            items = [p for p in items if int(p["clock"]) >= int(params["time_from"])]
+        if "eventid_till" in params:
+            items = [p for p in items if int(p["eventid"]) <= int(params["eventid_till"])]
+        items = sorted(items, key=lambda p: int(p["eventid"]), reverse=params.get("sortorder") == "DESC")
+        if "limit" in params:
+            items = items[:int(params["limit"])]
+        output = params.get("output", "extend")
+        result = []
+        for p in items:
+            row = {k: v for k, v in p.items() if k not in ("host", "tags", "acknowledges")
+                   and (output == "extend" or k in output)}
+            if "selectTags" in params:
+                row["tags"] = p["tags"]
+            if "selectAcknowledges" in params:
+                row["acknowledges"] = p["acknowledges"]
+            result.append(row)
+        return result
+
+    def _event_get(self, params):
+        if params.get("value") == 0:
+            time_from = int(params.get("time_from", 0))
+            return [{"objectid": r["objectid"]} for r in self.recoveries if r["clock"] >= time_from]
+        eventids = params.get("eventids", [])
+        eventids = eventids if isinstance(eventids, list) else [eventids]
+        result = []
+        for eventid in map(str, eventids):
+            p = self.problems.get(eventid)
+            if p is None:
+                continue
+            row = {"eventid": eventid}
+            if "selectHosts" in params:
+                row["hosts"] = [{"name": p["host"]}]
+            result.append(row)
+        return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Server JSON-RPC tiruan Zabbix")
+    parser.add_argument("--problems", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    mock = MockZabbixServer(generate_problems(args.problems, seed=args.seed), latency=args.latency, port=args.port)
+    logging.info(f"Mock Zabbix API with {args.problems} problems at {mock.url}")
+    try:
+        mock.serve_forever()
+    except KeyboardInterrupt:
+        pass
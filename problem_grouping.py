@@ -0,0 +1,128 @@
+import os
+import re
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Aturan pengelompokan problem Zabbix ke kategori laporan, dibaca dari file JSON:
+#   [{"group": "Temperature Issue", "contains": ["subslot 0/0 transceiver", "Temperature"]},
+#    {"group": "Windows: Space is critically low", "regex": "Space is critically low"}]
+# "contains": semua substring harus ada; "regex": pola re.search. Aturan pertama yang cocok menang;
+# nama yang tidak cocok dengan aturan mana pun menjadi kategorinya sendiri.
+# Pola regex tidak boleh berisi grup penangkap ((...), (?P<nama>...)) atau backreference, karena
+# semua aturan digabung menjadi satu regex; pakai grup non-penangkap (?:...).
+
+DEFAULT_RULES = [
+    {"group": "Windows: Space is critically low", "contains": ["Space is critically low"]},
+    {"group": "Temperature Issue", "contains": ["subslot 0/0 transceiver", "Temperature"]}
+]
+
+def rule_pattern(rule):
+    """
+    Mengubah satu aturan menjadi pola regex (lookahead per syarat), atau None jika tidak valid
+    (termasuk regex dengan grup penangkap atau backreference).
+    """
+    conditions = [re.escape(text) for text in rule.get("contains", [])]
+    if rule.get("regex"):
+        conditions.append(rule["regex"])
+    if not rule.get("group") or not conditions:
+        logger.error(f"Invalid grouping rule (needs group and contains/regex): {rule}")
+        return None
+    if rule.get("regex"):
+        try:
+            capturing = re.compile(rule["regex"]).groups
+        except re.error as e:
+            logger.error(f"Invalid regex in grouping rule {rule['group']!r}: {e}")
+            return None
+        if capturing:
+            logger.error(
+                f"Grouping rule {rule['group']!r} uses capturing groups or backreferences, "
+                "use non-capturing groups (?:...) instead"
+            )
+            return None
+    pattern = "".join(f"(?=.*?(?:{c}))" for c in conditions)
+    try:
+        re.compile(pattern, re.DOTALL)
+    except re.error as e:
+        logger.error(f"Invalid regex in grouping rule {rule['group']!r}: {e}")
+        return None
+    return pattern
+
+def rules_signature(path):
+    """
+    (path absolut, mtime, ukuran) file aturan, atau None jika file tidak ada.
+    """
+    try:
+        stat = os.stat(path)
+        return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    except (OSError, TypeError):
+        return None
+
+def load_rules(path):
+    """
+    Membaca aturan dari file JSON; jika file tidak ada atau rusak, memakai DEFAULT_RULES.
+    """
+    if not path or not os.path.exists(path):
+        return DEFAULT_RULES
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            rules = json.load(f)
+        if not isinstance(rules, list):
+            raise ValueError("rules must be a JSON list")
+        return rules
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to load grouping rules {path}: {e}, using defaults")
+        return DEFAULT_RULES
+
+class ProblemGrouper:
+    """
+    Semua aturan dikompilasi menjadi satu regex alternasi yang di-anchor di awal nama,
+    sehingga urutan alternatif = prioritas aturan. Jika gabungan gagal dikompilasi, setiap
+    aturan dicocokkan satu per satu. Hasil di-memo per nama problem unik.
+    """
+
+    def __init__(self, rules, signature=None):
+        self.signature = signature
+        self.groups = []
+        patterns = []
+        for rule in rules:
+            pattern = rule_pattern(rule)
+            if pattern is None:
+                continue
+            patterns.append(pattern)
+            self.groups.append(rule["group"])
+        self._matcher = None
+        self._rule_matchers = []
+        if patterns:
+            alternatives = [f"{pattern}(?P<r{i}>)" for i, pattern in enumerate(patterns)]
+            try:
+                self._matcher = re.compile(f"(?:{'|'.join(alternatives)})", re.DOTALL)
+            except re.error as e:
+                logger.error(f"Failed to combine grouping rules ({e}), matching rules one by one")
+                self._rule_matchers = [re.compile(pattern, re.DOTALL) for pattern in patterns]
+        self._memo = {}
+        logger.info(f"Compiled {len(self.groups)} problem grouping rules")
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(load_rules(path), rules_signature(path))
+
+    def group(self, problem):
+        """
+        Mengelompokkan nama problem ke kategori laporan.
+        """
+        problem = str(problem).strip()
+        found = self._memo.get(problem)
+        if found is None:
+            if self._matcher is not None:
+                match = self._matcher.match(problem)
+                index = int(match.lastgroup[1:]) if match else None
+            else:
+                index = next((i for i, m in enumerate(self._rule_matchers) if m.match(problem)), None)
+            found = problem if index is None else self.groups[index]
+            self._memo[problem] = found
+        return found
+
+    def memo_size(self):
+        return len(self._memo)
@@ -1,79 +1,221 @@
+import io
 import os
 import re
+import weakref
+from functools import lru_cache
+from xml.sax.saxutils import escape
 import tkinter as tk
 import ttkbootstrap as ttkb
 from ttkbootstrap.constants import *
 import pandas as pd
-from datetime import datetime
+import numpy as np
+from datetime import datetime, timedelta
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, LongTable, TableStyle, Flowable
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 import logging
 from tkinter import messagebox, filedialog
+from problem_grouping import ProblemGrouper, rules_signature
+from history_store import HistoryStore
+from shift_diff import compare_with_previous
+from background_job import run_in_background, JobCancelled, JobFailed
+from csv_ingest import ingest_csv_files, CsvSchemaError
+from log_config import setup_logging, sampled_debug
+
+logger = logging.getLogger(__name__)
+
+# Konfigurasi Logging
+setup_logging()
 
 # Impor fungsi dari zabbix_api.py
 try:
-    from zabbix_api import fetch_zabbix_data
+    from zabbix_api import fetch_zabbix_data, iter_zabbix_data
 except ImportError:
-    fetch_zabbix_data = None
-    logging.error("Failed to import fetch_zabbix_data from zabbix_api.py")
+    fetch_zabbix_data = iter_zabbix_data = None
+    logger.error("Failed to import fetch_zabbix_data from zabbix_api.py")
 
-# Konfigurasi Logging
-logging.basicConfig(
-    filename="recap_zabbix.log",
-    level=logging.DEBUG,
-    format="%(asctime)s - %(levelname)s - %(message)s"
+# Severity yang diambil untuk rekap: 4 = High, 5 = Disaster
+RECAP_SEVERITIES = [4, 5]
+
+# Format waktu yang dikenali, berurutan sesuai prioritas
+CALC_DATE_FORMATS = ("%Y-%m-%d %I:%M:%S %p", "%Y-%m-%d %H:%M:%S", "%m/%d/%Y %H:%M:%S")
+DISPLAY_DATE_FORMATS = CALC_DATE_FORMATS + ("%Y/%m/%d %H:%M", "%d-%b-%Y %H:%M")
+
+# Database riwayat problem (lihat history_store.py)
+HISTORY_DB_FILE = "zabbix_history.db"
+
+# Folder snapshot per laporan untuk perbandingan dengan rekap sebelumnya (lihat shift_diff.py)
+SNAPSHOT_DIR = "recap_snapshots"
+# Urutan serah terima: shift A dibandingkan dengan M sebelumnya, C dengan A, M dengan C;
+# rekap harian D dengan D hari sebelumnya
+PREVIOUS_SHIFT = {"A": "M", "C": "A", "M": "C", "D": "D"}
+
+# File aturan pengelompokan problem (lihat problem_grouping.py); dimuat ulang jika file berubah
+PROBLEM_GROUPS_FILE = "problem_groups.json"
+
+# Jendela shift: jam mulai, jam selesai, selesai di hari berikutnya, sampai akhir hari (23:59)
+SHIFT_WINDOWS = {
+    "A": (6, 15, 0, False),
+    "C": (14, 23, 0, False),
+    "M": (22, 7, 1, False),
+    "D": (0, 23, 0, True)
+}
+
+# Durasi: satuan -> detik, dan awalan nama satuan -> kode satuan (dicek berurutan)
+DURATION_UNIT_SECONDS = {
+    "y": 365 * 86400, "mo": 30 * 86400, "w": 7 * 86400, "d": 86400, "h": 3600, "min": 60, "s": 1, "ms": 0
+}
+DURATION_UNIT_PREFIXES = (
+    ("ms", "ms"), ("mo", "mo"), ("bulan", "mo"), ("minggu", "w"), ("mi", "min"), ("menit", "min"),
+    ("mnt", "min"), ("detik", "s"), ("jam", "h"), ("hari", "d"), ("tahun", "y"),
+    ("y", "y"), ("w", "w"), ("d", "d"), ("h", "h"), ("s", "s"), ("m", "m")
 )
+DURATION_TOKEN_PATTERN = re.compile(r"(\d+)\s*([a-zA-Z]+)")
+# Jumlah teks durasi (per menit) yang di-cache oleh format_duration
+DURATION_FORMAT_CACHE_SIZE = 65536
+
+# Cache format pemenang per bentuk string waktu (digit diganti 0), mis. "0000-00-00 00:00:00"
+_time_format_cache = {}
 
 # Fungsi Utilitas
-def parse_duration(duration_str):
-    total_seconds = 0
-    duration_str = str(duration_str).lower().strip()
-    matches = re.findall(r"(\d+)\s*([a-zA-Z]+)", duration_str)
-    for val, unit in matches:
-        val = int(val)
-        if unit.startswith("m") and ("bulan" in duration_str or "month" in duration_str):
-            total_seconds += val * 30 * 86400
-        elif unit.startswith("d"):
-            total_seconds += val * 86400
-        elif unit.startswith("h"):
-            total_seconds += val * 3600
-        elif unit.startswith("m") and ("menit" in duration_str or "minute" in duration_str or "m " in duration_str):
-            total_seconds += val * 60
-        elif unit.startswith("s"):
-            total_seconds += val
-    logging.debug(f"Parsed duration '{duration_str}' to {total_seconds} seconds")
-    return total_seconds
+def map_unique(series, func):
+    """
+    Menerapkan func sekali per nilai unik lalu memetakan hasilnya ke seluruh kolom.
+    """
+    uniques = series.unique()
+    return series.map(dict(zip(uniques, (func(v) for v in uniques))))
+
+def as_text(series):
+    """
+    Konversi kolom ke teks seperti str() (NaN -> "nan"), sekali per nilai unik.
+    Kolom kosong tetap bertipe object agar bisa digabung dengan string.
+    """
+    return map_unique(series, str).astype(object)
 
-def calculate_duration(start_time, status):
-    current_date = datetime.now()
-    for fmt in ("%Y-%m-%d %I:%M:%S %p", "%Y-%m-%d %H:%M:%S", "%m/%d/%Y %H:%M:%S"):
+def infer_time_format(value, formats):
+    """
+    Mencari format pertama di formats yang cocok untuk value. Hasilnya di-cache per bentuk
+    string (digit diganti 0), sehingga string lain dengan bentuk sama tidak dicoba ulang.
+    """
+    key = (re.sub(r"\d", "0", value), formats)
+    if key in _time_format_cache:
+        return _time_format_cache[key]
+    found = None
+    for fmt in formats:
         try:
-            start_date = datetime.strptime(start_time, fmt)
+            datetime.strptime(value, fmt)
+            found = fmt
             break
         except ValueError:
             continue
+    _time_format_cache[key] = found
+    return found
+
+def parse_timestamp(value, formats=DISPLAY_DATE_FORMATS):
+    """
+    Parse satu string waktu memakai format yang di-cache; None jika tidak ada format yang cocok.
+    """
+    value = str(value)
+    fmt = infer_time_format(value, formats)
+    if fmt is not None:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    # Bentuk sama tetapi nilai tidak valid untuk format ter-cache (mis. bulan 13)
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+def parse_time_column(series, formats):
+    """
+    Parse kolom waktu: format disimpulkan dari satu sampel lalu seluruh baris yang tersisa
+    di-parse dalam satu panggilan vektor; diulang paling banyak sekali per format.
+    Baris yang tetap gagal (outlier) di-parse per nilai unik, sisanya NaT.
+    """
+    if pd.api.types.is_string_dtype(series) and not series.isna().any():
+        text = series
     else:
-        logging.error(f"Invalid date format: {start_time}")
-        return 0
-    
-    if status == "PROBLEM":
-        delta = current_date - start_date
-        total_seconds = int(delta.total_seconds())
-    else:
-        total_seconds = 0
-    
-    logging.debug(f"Calculated duration for '{start_time}' (status: {status}) = {total_seconds} seconds")
-    return total_seconds * 1000
+        text = as_text(series)
+    parsed = pd.Series(pd.NaT, index=series.index, dtype="datetime64[ns]")
+    remaining = pd.Series(True, index=series.index)
+    passes = 0
+    while passes < len(formats) and remaining.any():
+        fmt = infer_time_format(text[remaining].iloc[0], formats)
+        if fmt is None:
+            break
+        parsed[remaining] = pd.to_datetime(text[remaining], format=fmt, errors="coerce")
+        remaining = parsed.isna()
+        passes += 1
+
+    fallback_rows = int(remaining.sum())
+    if fallback_rows:
+        fallback = map_unique(text[remaining], lambda v: parse_timestamp(v, formats))
+        parsed[remaining] = pd.to_datetime(fallback)
+    failed = int(parsed.isna().sum())
+    logger.debug(
+        f"Parsed {len(series)} timestamps in {passes} vectorized passes, "
+        f"{fallback_rows} rows via fallback, {failed} unparseable"
+    )
+    return parsed
+
+def from_epoch_seconds(clock):
+    """
+    Detik epoch (kolom clock dari API) -> waktu lokal naive, tanpa melewati teks.
+    """
+    from dateutil.tz import tzlocal
+    times = pd.to_datetime(pd.to_numeric(clock, errors="coerce"), unit="s", utc=True)
+    return times.dt.tz_convert(tzlocal()).dt.tz_localize(None)
+
+def start_times(df, formats=CALC_DATE_FORMATS):
+    """
+    Waktu mulai per baris: dari kolom clock jika ada (data API), selain itu parse kolom Time (CSV).
+    """
+    if "clock" in df:
+        return from_epoch_seconds(df["clock"])
+    return parse_time_column(df["Time"], formats)
+
+def duration_unit(unit):
+    """
+    Kode satuan untuk satu token durasi: y, mo, w, d, h, min, s, ms, atau "m" jika ambigu
+    (bulan atau menit, lihat parse_duration). None untuk satuan yang tidak dikenal.
+    """
+    if unit == "M":
+        return "mo"
+    unit = unit.lower()
+    for prefix, code in DURATION_UNIT_PREFIXES:
+        if unit.startswith(prefix):
+            return code
+    return None
 
-def standardize_duration(total_ms):
-    ms = total_ms
-    months = ms // (30 * 86400000)
-    days = (ms % (30 * 86400000)) // 86400000
-    hours = (ms % 86400000) // 3600000
-    minutes = (ms % 3600000) // 60000
+def parse_duration(duration_str):
+    """
+    Teks durasi (mis. "2d 3h 4m" dari export Zabbix atau "1 bulan 2 hari") -> detik.
+    "m" tanpa keterangan adalah bulan jika diikuti minggu/hari/jam atau didahului tahun
+    ("1m 2d 3h", "1y 2m"), selain itu menit ("3h 4m", "4m 5s").
+    """
+    tokens = [(int(val), duration_unit(unit)) for val, unit in DURATION_TOKEN_PATTERN.findall(str(duration_str))]
+    total_seconds = 0
+    for i, (val, code) in enumerate(tokens):
+        if code == "m":
+            after_year = i > 0 and tokens[i - 1][1] == "y"
+            before_day = i + 1 < len(tokens) and tokens[i + 1][1] in ("w", "d", "h")
+            code = "mo" if after_year or before_day else "min"
+        total_seconds += val * DURATION_UNIT_SECONDS.get(code, 0)
+    sampled_debug(logger, "parse_duration", "Parsed duration '%s' to %s seconds", duration_str, total_seconds)
+    return total_seconds
+
+@lru_cache(maxsize=DURATION_FORMAT_CACHE_SIZE)
+def format_minutes(total_minutes):
+    months = total_minutes // (30 * 1440)
+    days = (total_minutes % (30 * 1440)) // 1440
+    hours = (total_minutes % 1440) // 60
+    minutes = total_minutes % 60
 
     duration_parts = []
     if months > 0:
@@ -84,47 +226,81 @@ def standardize_duration(total_ms):
         duration_parts.append(f"{hours} jam")
     if minutes > 0:
         duration_parts.append(f"{minutes} menit")
-    result = " ".join(duration_parts) if duration_parts else "0 menit"
-    logging.debug(f"Standardized duration {total_ms}ms to '{result}'")
-    return result
+    return " ".join(duration_parts) if duration_parts else "0 menit"
+
+def format_duration(seconds):
+    """
+    Detik -> teks durasi laporan ("1 bulan 2 hari 3 jam 4 menit"), resolusi menit.
+    Hanya dipanggil saat render; hasil di-cache per jumlah menit. Nilai negatif menjadi 0.
+    """
+    return format_minutes(max(int(seconds), 0) // 60)
 
 def format_date(date_str):
-    for fmt in (
-        "%Y-%m-%d %I:%M:%S %p",
-        "%Y-%m-%d %H:%M:%S",
-        "%m/%d/%Y %H:%M:%S",
-        "%Y/%m/%d %H:%M",
-        "%d-%b-%Y %H:%M"
-    ):
-        try:
-            return datetime.strptime(date_str, fmt).strftime("%d/%m/%Y %H:%M")
-        except ValueError:
-            continue
-    logging.error(f"Failed to format date: {date_str}")
+    parsed = parse_timestamp(date_str, DISPLAY_DATE_FORMATS)
+    if parsed is not None:
+        return parsed.strftime("%d/%m/%Y %H:%M")
+    logger.error(f"Failed to format date: {date_str}")
     return str(date_str)
 
 def get_shift_date_range(shift, date_str):
     try:
         d = datetime.strptime(date_str.split()[0], "%Y-%m-%d")
-        shifts = {
-            "A": [6, 15, 0, False],
-            "C": [14, 23, 0, False],
-            "M": [22, 7, 1, False],
-            "D": [0, 23, 0, True]
-        }
-        start_hour, end_hour, next_day, is_full_day = shifts.get(shift, [0, 23, 0, True])
+        start_hour, end_hour, next_day, is_full_day = SHIFT_WINDOWS.get(shift, (0, 23, 0, True))
         start = d.replace(hour=start_hour, minute=0)
-        end = d.replace(hour=end_hour, minute=59 if is_full_day else 0)
-        if next_day:
-            end = end.replace(day=d.day + 1)
+        end = d.replace(hour=end_hour, minute=59 if is_full_day else 0) + timedelta(days=next_day)
         fmt = "%d/%m/%Y %H:%M"
         result = f"{start.strftime(fmt)} - {end.strftime(fmt)}"
-        logging.debug(f"Shift {shift} date range for {date_str}: {result}")
+        logger.debug(f"Shift {shift} date range for {date_str}: {result}")
         return result
     except Exception as e:
-        logging.error(f"Error parsing shift date '{date_str}': {str(e)}")
+        logger.error(f"Error parsing shift date '{date_str}': {str(e)}")
         return "Tanggal tidak valid"
 
+def get_shift_window(shift, reference=None):
+    """
+    Mengembalikan (start, end) shift terakhir yang sudah dimulai pada waktu reference
+    (default: sekarang), atau None untuk shift yang tidak dikenal.
+    """
+    if shift not in SHIFT_WINDOWS:
+        return None
+    reference = reference or datetime.now()
+    start_hour, end_hour, next_day, is_full_day = SHIFT_WINDOWS[shift]
+    start = reference.replace(hour=start_hour, minute=0, second=0, microsecond=0)
+    if start > reference:
+        start -= timedelta(days=1)
+    end = start.replace(hour=end_hour) + timedelta(days=next_day)
+    if is_full_day:
+        end = end.replace(minute=59, second=59, microsecond=999999)
+    return start, end
+
+def duration_reference(shift, reference=None, now=None):
+    """
+    Waktu acuan durasi problem open: akhir jendela shift (laporan "pada akhir shift"), atau
+    now (default: sekarang) jika shift belum berakhir atau tidak punya jendela.
+    """
+    now = now or datetime.now()
+    window = get_shift_window(shift, reference)
+    return min(window[1], now) if window else now
+
+def parse_reference_date(text):
+    """
+    "YYYY-MM-DD" -> reference di akhir hari tersebut (23:59:59), sehingga setiap shift adalah yang
+    dimulai pada tanggal itu (M berakhir esok paginya). Teks kosong -> None (sekarang).
+    Melempar ValueError untuk format yang salah.
+    """
+    text = (text or "").strip()
+    if not text:
+        return None
+    return datetime.strptime(text, "%Y-%m-%d").replace(hour=23, minute=59, second=59)
+
+def get_period_date(shift, first_date, reference=None):
+    """
+    Tanggal acuan untuk header periode: tanggal mulai jendela shift, atau first_date jika
+    shift tidak punya jendela.
+    """
+    window = get_shift_window(shift, reference)
+    return window[0].strftime("%Y-%m-%d") if window else first_date
+
 def get_shift_header(shift):
     headers = {
         "A": "Selamat sore, berikut rekap shift problem Zabbix monitoring IFG pada akhir shift A",
@@ -133,195 +309,641 @@ def get_shift_header(shift):
         "D": "Selamat malam, berikut rekap daily problem Zabbix monitoring IFG",
     }
     header = headers.get(shift, "Selamat malam, berikut rekap problem Zabbix monitoring IFG")
-    logging.debug(f"Shift header for {shift}: {header}")
+    logger.debug(f"Shift header for {shift}: {header}")
     return header
 
+# Indeks Waktu untuk Filter Shift
+_time_index_cache = {"ref": None, "index": None}
+
+def build_time_index(df):
+    """
+    Membangun indeks waktu: posisi baris terurut menurut waktu mulai, waktu selesai aktivitas
+    (mulai + durasi), status open (PROBLEM) dan rentang terpanjang problem yang sudah selesai.
+    """
+    start = start_times(df)
+    if "duration_s" in df:
+        span = df["duration_s"]
+    elif "Duration" in df:
+        span = map_unique(df["Duration"], parse_duration)
+    else:
+        span = 0
+    end = start + pd.to_timedelta(span, unit="s")
+    is_open = (df["Status"] == "PROBLEM").to_numpy()
+
+    valid = start.notna().to_numpy()
+    start_values = start.to_numpy()
+    order = np.argsort(start_values[valid], kind="stable")
+    positions = np.flatnonzero(valid)[order]
+    starts = start_values[positions]
+    ends = end.to_numpy()[positions]
+    opens = is_open[positions]
+    closed_spans = (ends - starts)[~opens]
+    return {
+        "positions": positions,
+        "starts": starts,
+        "ends": ends,
+        "opens": opens,
+        "open_idx": np.flatnonzero(opens),
+        "max_span": closed_spans.max() if len(closed_spans) else np.timedelta64(0, "s"),
+        "unparsed": np.flatnonzero(~valid)
+    }
+
+def get_time_index(df):
+    """
+    Indeks waktu untuk df; di-cache selama objek DataFrame yang sama dipakai lagi
+    (mis. Generate Report lalu Export to PDF, atau ganti shift).
+    """
+    if _time_index_cache["ref"] is not None and _time_index_cache["ref"]() is df:
+        return _time_index_cache["index"]
+    index = build_time_index(df)
+    _time_index_cache["ref"], _time_index_cache["index"] = weakref.ref(df), index
+    return index
+
+def unparsed_time_rows(df):
+    """
+    Baris df yang waktu mulainya tidak bisa di-parse (tidak pernah lolos filter jendela shift).
+    """
+    return df.iloc[get_time_index(df)["unparsed"]]
+
+def select_shift_rows(df, window_start, window_end):
+    """
+    Memilih baris yang mulai atau masih aktif di dalam jendela shift memakai searchsorted pada
+    indeks waktu: hanya kandidat dengan mulai di [window_start - max_span, window_end] dan
+    problem open yang mulai sebelum batas bawah yang diperiksa. Urutan baris asli dipertahankan.
+    """
+    index = get_time_index(df)
+    starts = index["starts"]
+    window_start = np.datetime64(window_start)
+    window_end = np.datetime64(window_end)
+    hi = starts.searchsorted(window_end, side="right")
+    lo = min(starts.searchsorted(window_start - index["max_span"], side="left"), hi)
+    candidates = np.arange(lo, hi)
+    keep = index["opens"][lo:hi] | (index["ends"][lo:hi] >= window_start)
+    open_before = index["open_idx"][:index["open_idx"].searchsorted(lo)]
+    selected = np.sort(index["positions"][np.concatenate([open_before, candidates[keep]])])
+    if len(index["unparsed"]):
+        logger.warning(f"{len(index['unparsed'])} rows without a valid start time excluded from shift window")
+    logger.info(f"Shift window {window_start} - {window_end}: {len(selected)} of {len(df)} rows selected")
+    return df.iloc[selected]
+
 # Fungsi Analisis Data
-def analyze_data(df, shift, operator_name):
-    if df.empty:
-        logging.warning("Empty DataFrame provided to analyze_data")
-        return "", None
+TICKET_PATTERN = r"__zbx_jira_issuekey\s*[:=]\s*(IFG-\d+|[\w-]+)"
+# Ukuran potongan saat analisis dengan laporan progres
+ANALYZE_CHUNK_ROWS = 20000
 
-    seen_problems = set()
-    problem_groups = {}
-    first_date = None
+_grouper = None
+_history_store = None
+
+def get_history_store():
+    global _history_store
+    if _history_store is None or _history_store.path != HISTORY_DB_FILE:
+        _history_store = HistoryStore(HISTORY_DB_FILE)
+    return _history_store
+
+def get_problem_grouper():
+    """
+    ProblemGrouper untuk PROBLEM_GROUPS_FILE; dikompilasi ulang hanya jika file berubah.
+    """
+    global _grouper
+    if _grouper is None or _grouper.signature != rules_signature(PROBLEM_GROUPS_FILE):
+        _grouper = ProblemGrouper.from_file(PROBLEM_GROUPS_FILE)
+    return _grouper
+
+def group_problem(problem):
+    """
+    Mengelompokkan nama problem ke kategori laporan.
+    """
+    return get_problem_grouper().group(problem)
+
+def format_recap_line(host, duration, start, ticket_id, status):
+    return f"- {host}  Durasi: {duration} (start {start}) Ticket ID: {ticket_id} *{status}*"
+
+class RecapGroup:
+    """
+    Entri satu kategori problem dalam bentuk kolom (list paralel); durasi disimpan dalam detik
+    dan baru diformat saat render. Laporan teks dan tabel PDF sama-sama dirender dari objek ini.
+    """
+    __slots__ = ("hosts", "durations", "starts", "ticket_ids", "statuses")
+
+    def __init__(self):
+        self.hosts = []
+        self.durations = []
+        self.starts = []
+        self.ticket_ids = []
+        self.statuses = []
+
+    def __len__(self):
+        return len(self.hosts)
+
+    def extend(self, records):
+        # records boleh membawa kolom lain (mis. kolom riwayat); hanya kolom laporan yang diambil
+        self.hosts.extend(records["host"].tolist())
+        self.durations.extend(records["duration"].tolist())
+        self.starts.extend(records["start"].tolist())
+        self.ticket_ids.extend(records["ticket_id"].tolist())
+        self.statuses.extend(records["status"].tolist())
+
+    def rows(self, start=0, end=None):
+        columns = (self.hosts, self.durations, self.starts, self.ticket_ids, self.statuses)
+        if start or end is not None:
+            columns = [col[start:end] for col in columns]
+        hosts, durations, starts, ticket_ids, statuses = columns
+        return zip(hosts, map(format_duration, durations), starts, ticket_ids, statuses)
+
+    def lines(self):
+        return [format_recap_line(*row) for row in self.rows()]
+
+    def sort(self):
+        """
+        Mengurutkan entri sesuai urutan baris laporan teks.
+        """
+        lines = self.lines()
+        order = sorted(range(len(lines)), key=lines.__getitem__)
+        for name in self.__slots__:
+            column = getattr(self, name)
+            setattr(self, name, [column[i] for i in order])
+
+class RecapGroups(dict):
+    """
+    Kategori -> RecapGroup, ditambah diff (ShiftDiff terhadap rekap sebelumnya, atau None).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.diff = None
+
+DIFF_SECTIONS = (("new", "Baru"), ("resolved", "Resolved"), ("carried", "Masih open"))
+
+def diff_status(is_open):
+    if is_open is None:
+        return "Tidak ada di data"
+    return "Belum Resolved" if is_open else "Resolved"
+
+def format_duration_delta(delta_s):
+    if delta_s is None:
+        return "-"
+    sign = "+" if delta_s >= 0 else "-"
+    return sign + format_duration(abs(delta_s))
+
+def diff_rows(entries):
+    """
+    Baris (host, problem, durasi, selisih, status) terurut untuk satu bagian diff.
+    """
+    return sorted(
+        (host, problem, format_duration(duration_s), format_duration_delta(delta_s), diff_status(is_open))
+        for host, problem, is_open, duration_s, delta_s in entries
+    )
+
+def diff_title(diff):
+    start = diff.previous_start.strftime("%d/%m/%Y %H:%M")
+    return f"Perubahan dari rekap sebelumnya (shift {diff.previous_shift}, mulai {start})"
+
+def diff_report(diff):
+    """
+    Bagian laporan teks untuk ShiftDiff.
+    """
+    lines = [diff_title(diff)]
+    if not len(diff):
+        lines.append("Tidak ada perubahan")
+    for attr, label in DIFF_SECTIONS:
+        rows = diff_rows(getattr(diff, attr))
+        lines.append(f"{label}: {len(rows)}")
+        lines.extend(
+            f"- {host}  {problem}  Durasi: {duration} (selisih {delta}) *{status}*"
+            for host, problem, duration, delta, status in rows
+        )
+    return "\n".join(lines) + "\n\n"
+
+def to_epoch_seconds(times):
+    """
+    Waktu lokal (naive) -> detik epoch sebagai list int (None untuk NaT).
+    """
+    from dateutil.tz import tzlocal
+    local = times.dt.tz_localize(tzlocal(), ambiguous="NaT", nonexistent="shift_forward")
+    seconds = (local - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+    return [None if pd.isna(v) else int(v) for v in seconds]
+
+def _analyze_chunk(chunk, now, seen):
+    """
+    Analisis satu DataFrame secara vektor. Mengembalikan (filtered, first_date, records)
+    dengan records (host, duration, start, ticket_id, status, group, dan kolom riwayat eventid,
+    clock, problem, zabbix_status, duration_s) hanya berisi baris unik yang lolos filter status.
+    duration dan duration_s dalam detik.
+    """
+    valid = chunk["Status"].isin(["PROBLEM", "RESOLVED"])
+    invalid = chunk[~valid]
+    filtered = (
+        "Invalid status: " + as_text(invalid["Problem"]) + " (Host: " + as_text(invalid["Host"]) + ")"
+    ).tolist()
+
+    rows = chunk[valid]
+    keys = pd.DataFrame({
+        col: as_text(rows[col]) if col in rows else "N/A" for col in ["Host", "Time", "Problem", "EventID"]
+    }, index=rows.index)
+    rows = rows[~keys.duplicated()]
+    keys = keys.loc[rows.index]
+    if seen is not None:
+        # Dedupe antar potongan data (mode streaming)
+        key_tuples = list(keys.itertuples(index=False, name=None))
+        fresh = [k not in seen for k in key_tuples]
+        seen.update(key_tuples)
+        rows, keys = rows[fresh], keys[fresh]
+    if rows.empty:
+        return filtered, None, None
+
+    status = rows["Status"].map({"PROBLEM": "Belum Resolved", "RESOLVED": "Resolved"})
+    ticket_id = (
+        as_text(rows["Tags"]).str.strip()
+        .str.extract(TICKET_PATTERN, flags=re.IGNORECASE, expand=False)
+        .fillna("IFG-Unknown")
+    )
+
+    start_calc = start_times(rows)
+    invalid_dates = int(start_calc.isna().sum())
+    if invalid_dates:
+        logger.error(f"Invalid date format in {invalid_dates} rows")
+    # Durasi dihitung sekali dalam detik (int64) untuk seluruh kolom; teks baru dibuat saat render.
+    # Problem open: sejak clock (data API) atau waktu mulai hasil parse Time (CSV) sampai sekarang.
+    # Problem resolved: kolom duration_s dari sumber data jika ada, selain itu teks Duration
+    # (export CSV) di-parse sekali per nilai unik.
+    is_open = rows["Status"] == "PROBLEM"
+    if "clock" in rows:
+        clock = pd.to_numeric(rows["clock"], errors="coerce")
+        open_seconds = (int(now.timestamp()) - clock).fillna(0).astype("int64")
+    else:
+        clock = None
+        open_seconds = (now - start_calc).dt.total_seconds().fillna(0).astype("int64")
+    if "duration_s" in rows:
+        closed_seconds = rows["duration_s"].fillna(0)
+    elif "Duration" in rows:
+        closed_seconds = map_unique(rows["Duration"], parse_duration)
+    else:
+        closed_seconds = 0
+
+    start_display = start_calc if clock is not None else parse_time_column(rows["Time"], DISPLAY_DATE_FORMATS)
+    unparsed = start_display.isna()
+    start_text = start_display.dt.strftime("%d/%m/%Y %H:%M").where(~unparsed, as_text(rows["Time"]))
+    if unparsed.any():
+        logger.error(f"Failed to format date in {int(unparsed.sum())} rows")
+
+    records = pd.DataFrame({
+        "host": as_text(rows["Host"]),
+        # Laporan menampilkan durasi hanya untuk problem yang masih open
+        "duration": open_seconds.where(is_open, 0),
+        "start": start_text,
+        "ticket_id": ticket_id,
+        "status": status,
+        "group": map_unique(rows["Problem"], get_problem_grouper().group),
+        # Kolom untuk history store: EventID, atau "host|time|problem" jika tidak ada EventID
+        "eventid": keys["EventID"].where(
+            ~keys["EventID"].isin(["N/A", "nan"]), keys["Host"] + "|" + keys["Time"] + "|" + keys["Problem"]
+        ),
+        "clock": to_epoch_seconds(start_calc) if clock is None else [None if pd.isna(v) else int(v) for v in clock],
+        "problem": keys["Problem"],
+        "zabbix_status": as_text(rows["Status"]),
+        "duration_s": open_seconds.where(is_open, closed_seconds).astype("int64")
+    })
+    return filtered, rows["Time"].iloc[0], records
+
+def analyze_data(df, shift, operator_name, reference=None, progress=None, save_artifacts=True,
+                 window_filtered=False, now=None):
+    # df boleh berupa DataFrame atau iterable potongan DataFrame (mis. dari iter_zabbix_data).
+    # Hanya baris yang mulai/aktif di jendela shift (relatif terhadap reference) yang dianalisis;
+    # window_filtered=True berarti df sudah dipilih per jendela (mis. partition_by_shift).
+    # Durasi problem open dihitung sampai akhir jendela shift (atau now - default sekarang, mis.
+    # waktu data dimuat - jika shift belum berakhir), lihat duration_reference.
+    # progress(stage, done, total) dipanggil per potongan (mis. Job.progress dari background_job).
+    # Problem unik dan problem yang difilter disimpan ke history store (HISTORY_DB_FILE);
+    # Snapshot laporan disimpan di SNAPSHOT_DIR dan dibandingkan dengan rekap sebelumnya; hasilnya
+    # ada di problem_groups.diff dan bagian perubahan di laporan.
+    # save_artifacts=False melewati penyimpanan dan perbandingan (mis. saat beberapa shift
+    # dianalisis paralel).
+    window = get_shift_window(shift, reference)
     filtered_problems = []
-    raw_entries = []
 
-    # Ambil rentang shift untuk filter tanggal (opsional)
-    shift_start, shift_end = None, None
-    if shift == "D":
-        try:
-            d = datetime.now()
-            shift_start = d.replace(hour=0, minute=0, second=0, microsecond=0)
-            shift_end = d.replace(hour=23, minute=59, second=59, microsecond=999999)
-        except Exception as e:
-            logging.error(f"Error setting shift range: {e}")
-
-    for _, row in df.iterrows():
-        if row["Status"] not in ["PROBLEM", "RESOLVED"]:
-            logging.debug(f"Skipping row with invalid status: {row['Status']} (Host: {row['Host']})")
-            filtered_problems.append(f"Invalid status: {row['Problem']} (Host: {row['Host']})")
-            continue
+    def select_window(rows):
+        # Baris tanpa waktu mulai valid dicatat sebagai problem yang difilter
+        bad = unparsed_time_rows(rows)
+        if len(bad):
+            filtered_problems.extend((
+                "Invalid time: " + as_text(bad["Problem"]) + " (Host: " + as_text(bad["Host"]) + ")"
+            ).tolist())
+        return select_shift_rows(rows, *window)
 
-        # Simpan entri mentah untuk debugging
-        raw_entries.append({
-            "Host": row["Host"],
-            "Time": row["Time"],
-            "Problem": row["Problem"],
-            "Status": row["Status"],
-            "Duration": row["Duration"],
-            "Tags": row["Tags"],
-            "EventID": row.get("EventID", "N/A")
-        })
-
-        duration_ms = parse_duration(row["Duration"])
-        problem_key = f"{row['Host']}-{row['Time']}-{row['Problem']}-{row.get('EventID', 'N/A')}"
-        if problem_key not in seen_problems:
-            seen_problems.add(problem_key)
-            if first_date is None:
-                first_date = row["Time"]
-
-            status = "Belum Resolved" if row["Status"] == "PROBLEM" else "Resolved"
-            tags = str(row["Tags"]).strip()
-            ticket_match = re.search(
-                r"__zbx_jira_issuekey\s*[:=]\s*(IFG-\d+|[\w-]+)",
-                tags,
-                re.IGNORECASE
-            )
-            ticket_id = ticket_match.group(1) if ticket_match else "IFG-Unknown"
-            
-            logging.debug(
-                f"EventID: {row.get('EventID', 'N/A')}, "
-                f"Host: {row['Host']}, "
-                f"Problem: {row['Problem']}, "
-                f"Tags: {tags}, "
-                f"Ticket ID: {ticket_id}"
-            )
-            
-            duration_ms = calculate_duration(row["Time"], row["Status"])
-            host_display = row["Host"]
-            
-            entry = (
-                f"- {host_display}  Durasi: {standardize_duration(duration_ms)} "
-                f"(start {format_date(row['Time'])}) Ticket ID: {ticket_id} *{status}*"
-            )
-
-            # Kelompokkan problem
-            problem = str(row["Problem"]).strip()
-            if "Windows: FS" in problem and "Space is critically low" in problem:
-                problem = "Windows: Space is critically low"
-            elif "Space is critically low" in problem:
-                problem = "Windows: Space is critically low"
-            elif "subslot 0/0 transceiver" in problem and "Temperature" in problem:
-                problem = "Temperature Issue"
-
-            if problem not in problem_groups:
-                problem_groups[problem] = []
-            problem_groups[problem].append(entry)
-
-    # Simpan entri mentah ke CSV
-    try:
-        pd.DataFrame(raw_entries).to_csv("zabbix_processed_data.csv", index=False)
-        logging.info("Saved processed data to zabbix_processed_data.csv")
-    except Exception as e:
-        logging.error(f"Failed to save processed data: {e}")
+    total = None
+    if isinstance(df, pd.DataFrame):
+        if df.empty:
+            logger.warning("Empty DataFrame provided to analyze_data")
+            return "", None
+        rows = select_window(df) if window and not window_filtered else df
+        total = len(rows)
+        if progress is None:
+            chunks, seen = [rows], None
+        else:
+            chunks, seen = (rows.iloc[i:i + ANALYZE_CHUNK_ROWS] for i in range(0, total, ANALYZE_CHUNK_ROWS)), set()
+    else:
+        chunks, seen = df, set()
+        if window and not window_filtered:
+            chunks = (select_window(chunk) for chunk in chunks)
+
+    problem_groups = RecapGroups()
+    first_date = None
+    history_records = []
+
+    now = duration_reference(shift, reference, now)
+    rows_done = 0
+    # Data API (kolom clock) hanya berisi problem yang masih aktif
+    active_only = False
+    for chunk in chunks:
+        active_only = active_only or "clock" in chunk
+        filtered, chunk_first_date, records = _analyze_chunk(chunk, now, seen)
+        rows_done += len(chunk)
+        if progress:
+            progress("Menganalisis data", rows_done, total)
+        filtered_problems.extend(filtered)
+        if records is None:
+            continue
+        history_records.append(records)
+        if first_date is None:
+            first_date = chunk_first_date
+        for problem, group_records in records.groupby("group", sort=False):
+            problem_groups.setdefault(problem, RecapGroup()).extend(group_records)
+        logger.debug(f"Analyzed chunk with {len(chunk)} rows, {len(records)} unique problems")
 
     if filtered_problems:
-        logging.info(f"Filtered problems: {', '.join(filtered_problems)}")
-        with open("filtered_problems.txt", "w") as f:
-            f.write("\n".join(filtered_problems))
-        logging.info("Saved filtered problems to filtered_problems.txt")
+        logger.info(f"Filtered problems: {', '.join(filtered_problems)}")
+    if save_artifacts:
+        records = pd.concat(history_records, ignore_index=True) if history_records else None
+        # Problem open di riwayat yang tidak ada lagi di data API (dan seharusnya masuk jendela
+        # ini jika masih aktif) ditandai resolved
+        resolve_before = int((window[1] if window else now).timestamp()) if active_only else None
+        get_history_store().save_run(records, shift, operator_name, filtered_problems, resolve_before)
+        window_start = window[0] if window else now
+        problem_groups.diff = compare_with_previous(
+            SNAPSHOT_DIR, records, shift, window_start, PREVIOUS_SHIFT.get(shift, shift)
+        )
 
     if not problem_groups:
-        logging.warning("No problems met criteria")
+        logger.warning("No problems met criteria")
         return "", None
 
-    report = f"{get_shift_header(shift)}\n{get_shift_date_range(shift, first_date)}\n\n"
+    for group in problem_groups.values():
+        group.sort()
+
+    report = f"{get_shift_header(shift)}\n{get_shift_date_range(shift, get_period_date(shift, first_date, reference))}\n\n"
     for problem in sorted(problem_groups.keys()):
-        report += f"{problem}\n" + "\n".join(sorted(problem_groups[problem])) + "\n\n"
+        report += f"{problem}\n" + "\n".join(problem_groups[problem].lines()) + "\n\n"
+    if problem_groups.diff is not None:
+        report += diff_report(problem_groups.diff)
     report += f"Terima kasih\nFDS Monitoring - {operator_name}"
     
-    logging.info(f"Generated report with {len(problem_groups)} problem groups")
+    logger.info(f"Generated report with {len(problem_groups)} problem groups")
     return report, problem_groups
 
+# Cache Data dan Analisis
+# Satu slot untuk data yang dimuat dan satu untuk hasil analisis, agar Export to PDF memakai
+# hasil yang sama dengan laporan yang baru saja ditampilkan. Durasi dihitung sampai waktu data
+# dimuat (data_loaded_at), sehingga hasil analisis tetap berlaku sampai data dimuat ulang.
+# Data API dianggap basi setelah API_DATA_TTL detik sejak diambil.
+API_DATA_TTL = 300
+_data_cache = {"key": None, "df": None, "loaded": None}
+_analysis_cache = {"key": None, "result": None}
+
+def file_signature(paths):
+    """
+    Identitas set file: (path absolut, mtime, ukuran) per file.
+    """
+    signature = []
+    for path in paths:
+        stat = os.stat(path)
+        signature.append((os.path.abspath(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+def data_cache_key(data_source, files):
+    return (data_source, file_signature(files) if data_source == "CSV" else ())
+
+def get_cached_data(key):
+    if _data_cache["key"] != key:
+        return None
+    if key[0] == "API" and datetime.now() - _data_cache["loaded"] > timedelta(seconds=API_DATA_TTL):
+        logger.info(f"Cached API data older than {API_DATA_TTL}s, fetching again")
+        return None
+    return _data_cache["df"]
+
+def store_data(key, df):
+    _data_cache["key"], _data_cache["df"], _data_cache["loaded"] = key, df, datetime.now()
+    _analysis_cache["key"], _analysis_cache["result"] = None, None
+
+def data_loaded_at():
+    """
+    Waktu data di cache dimuat; dipakai sebagai now untuk analyze_data.
+    """
+    return _data_cache["loaded"]
+
+def analysis_cache_key(data_key, shift, operator_name, reference=None, now=None):
+    """
+    Kunci hasil analisis: data, shift, operator, aturan grouping (mengubah PROBLEM_GROUPS_FILE
+    membuat analisis dihitung ulang), reference dan now (waktu acuan durasi, lihat analyze_data).
+    Memuat data baru membuang hasil analisis (store_data).
+    """
+    return (data_key, shift, operator_name, get_problem_grouper().signature, reference, now)
+
+def get_cached_analysis(key):
+    return _analysis_cache["result"] if _analysis_cache["key"] == key else None
+
+def store_analysis(key, result):
+    # key dari analysis_cache_key, dihitung sebelum analisis dimulai
+    _analysis_cache["key"], _analysis_cache["result"] = key, result
+
+def invalidate_recap_cache():
+    """
+    Membuang data dan hasil analisis yang di-cache.
+    """
+    store_data(None, None)
+    logger.info("Recap cache invalidated")
+
 # Fungsi Ekspor PDF
-def export_to_pdf(df, shift, operator_name):
-    report, problem_groups = analyze_data(df, shift, operator_name)
-    if not report:
-        messagebox.showwarning("Peringatan", "Tidak ada data yang memenuhi kriteria!")
-        logging.warning("No report generated for PDF export")
-        return
+PDF_HEADER = ["Host", "Duration", "Time Start", "Ticket ID", "Status"]
+PDF_COL_WIDTHS = [2*inch, 2*inch, 1.5*inch, 1*inch, 1*inch]
+# Satu TableStyle dipakai bersama oleh semua tabel
+PDF_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
+    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, -1), 9),
+    ("BOTTOMPADDING", (0, 0), (-1, 0), 6),
+    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ("WORDWRAP", (0, 0), (-1, -1), "CJK"),  # Support text wrapping
+])
+PDF_DIFF_HEADER = ["Host", "Problem", "Duration", "Selisih", "Status"]
+PDF_DIFF_COL_WIDTHS = [1.6*inch, 2.4*inch, 1.4*inch, 1.1*inch, 1*inch]
+# Baris per potongan tabel (kira-kira satu halaman); kategori besar dipecah menjadi beberapa tabel
+PDF_TABLE_CHUNK_ROWS = 40
+# Jumlah flowable yang disiapkan di depan posisi penataan halaman (lihat LazyStory)
+PDF_STORY_BATCH = 32
+
+class DiffTableRows:
+    """
+    Baris satu bagian diff untuk DeferredTable; kolom problem dibungkus Paragraph saat tabel
+    dibuat agar nama problem yang panjang terlipat.
+    """
+
+    def __init__(self, rows, style):
+        self._rows = rows
+        self.style = style
+
+    def __len__(self):
+        return len(self._rows)
+
+    def rows(self, start=0, end=None):
+        return (
+            (host, Paragraph(escape(problem), self.style), duration, delta, status)
+            for host, problem, duration, delta, status in self._rows[start:end]
+        )
+
+class DeferredTable(Flowable):
+    """
+    Potongan baris [start, end) dari satu RecapGroup (atau objek lain dengan rows(start, end)).
+    LongTable (header berulang) baru dibuat saat frame membutuhkannya, sehingga hanya tabel untuk
+    halaman yang sedang disusun yang ada di memori.
+    """
+
+    def __init__(self, group, start, end, header=PDF_HEADER, col_widths=PDF_COL_WIDTHS):
+        super().__init__()
+        self.group = group
+        self.start = start
+        self.end = end
+        self.header = header
+        self.col_widths = col_widths
+        self._table = None
+
+    def table(self):
+        if self._table is None:
+            rows = [self.header]
+            rows.extend(list(row) for row in self.group.rows(self.start, self.end))
+            self._table = LongTable(rows, colWidths=self.col_widths, repeatRows=1, style=PDF_TABLE_STYLE)
+        return self._table
+
+    def wrap(self, availWidth, availHeight):
+        self.width, self.height = self.table().wrap(availWidth, availHeight)
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        parts = self.table().split(availWidth, availHeight)
+        self._table = None
+        return parts
+
+    def drawOn(self, canvas, x, y, _sW=0):
+        table, self._table = self.table(), None
+        table.drawOn(canvas, x, y, _sW)
+
+def iter_pdf_story(problem_groups, shift, operator_name, first_date, progress=None):
+    """
+    Menghasilkan flowable PDF per kategori; tabel besar dipecah menjadi DeferredTable.
+    """
+    styles = getSampleStyleSheet()
+
+    centered_title = styles['Title']
+    centered_title.alignment = 1
+    centered_normal = styles['Normal']
+    centered_normal.alignment = 1
+    centered_heading = styles['Heading2']
+    centered_heading.alignment = 1
+
+    first_date = first_date or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    yield Paragraph("IFG Zabbix Monitoring Issue Summary", centered_title)
+    yield Paragraph(f"Period: {get_shift_date_range(shift, first_date)}", centered_normal)
+    yield Paragraph(f"Created By: FDS Monitoring - {operator_name}", centered_normal)
+    yield Spacer(1, 12)
+
+    categories = sorted(problem_groups.keys())
+    for i, title in enumerate(categories, 1):
+        group = problem_groups[title]
+        yield Paragraph(title, centered_heading)
+        if not len(group):
+            yield Paragraph("Tidak ada masalah untuk kategori ini.", centered_normal)
+            logger.info(f"No entries for problem category: {title}")
+        for start in range(0, len(group), PDF_TABLE_CHUNK_ROWS):
+            yield DeferredTable(group, start, min(start + PDF_TABLE_CHUNK_ROWS, len(group)))
+        yield Spacer(1, 12)
+        if progress:
+            progress("Menyusun tabel PDF", i, len(categories))
+
+    diff = getattr(problem_groups, "diff", None)
+    if diff is not None:
+        yield from iter_pdf_diff(diff, centered_heading, centered_normal, styles["BodyText"])
+
+def iter_pdf_diff(diff, heading_style, normal_style, cell_style):
+    """
+    Flowable bagian perubahan dari rekap sebelumnya: satu tabel per bagian (baru/resolved/masih open).
+    """
+    yield Paragraph(diff_title(diff), heading_style)
+    if not len(diff):
+        yield Paragraph("Tidak ada perubahan", normal_style)
+    for attr, label in DIFF_SECTIONS:
+        rows = DiffTableRows(diff_rows(getattr(diff, attr)), cell_style)
+        yield Paragraph(f"{label}: {len(rows)}", normal_style)
+        for start in range(0, len(rows), PDF_TABLE_CHUNK_ROWS):
+            yield DeferredTable(rows, start, min(start + PDF_TABLE_CHUNK_ROWS, len(rows)),
+                                PDF_DIFF_HEADER, PDF_DIFF_COL_WIDTHS)
+        yield Spacer(1, 12)
+
+class LazyStory(list):
+    """
+    List flowable untuk doc.build yang diisi dari generator sedikit demi sedikit: paling banyak
+    `batch` flowable yang sudah dibuat tetapi belum ditata berada di memori pada satu waktu.
+    doc.build hanya memakai len(), indeks, del dan penyisipan di depan, sehingga cukup
+    mengisi ulang buffer saat len() atau indeks dibaca.
+    """
 
+    def __init__(self, flowables, batch):
+        super().__init__()
+        self._source = iter(flowables)
+        self.batch = batch
+        self._fill()
+
+    def _fill(self):
+        while self._source is not None and super().__len__() < self.batch:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        self._fill()
+        return super().__len__()
+
+    def __getitem__(self, index):
+        self._fill()
+        return super().__getitem__(index)
+
+def render_pdf(problem_groups, shift, operator_name, first_date, output_path=None, progress=None):
+    """
+    Menyusun PDF rekap dari problem_groups (RecapGroup per kategori) ke output_path (tanpa dialog UI).
+    Jika output_path None, PDF ditulis ke io.BytesIO yang dikembalikan (posisi di awal).
+    progress(stage, done, total) dipanggil per kategori dan per halaman yang selesai di-build.
+    """
+    target = output_path if output_path is not None else io.BytesIO()
+    doc = SimpleDocTemplate(target, pagesize=letter)
+    story = LazyStory(iter_pdf_story(problem_groups, shift, operator_name, first_date, progress), PDF_STORY_BATCH)
+
+    def on_page(canvas, document):
+        if progress:
+            progress("Menulis halaman PDF", document.page, None)
+
+    doc.build(story, onFirstPage=on_page, onLaterPages=on_page)
+    if output_path is None:
+        target.seek(0)
+        return target
+    return output_path
+
+def pdf_output_path():
     output_folder = os.path.join(os.getcwd(), "zabbix_recap")
     os.makedirs(output_folder, exist_ok=True)
     file_name = f"Zabbix_Report_{datetime.now().strftime('%Y-%m-%d')}.pdf"
-    output_path = os.path.join(output_folder, file_name)
-
-    try:
-        doc = SimpleDocTemplate(output_path, pagesize=letter)
-        styles = getSampleStyleSheet()
-
-        centered_title = styles['Title']
-        centered_title.alignment = 1
-        centered_normal = styles['Normal']
-        centered_normal.alignment = 1
-        centered_heading = styles['Heading2']
-        centered_heading.alignment = 1
-
-        first_date = df.iloc[0]["Time"] if not df.empty else datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        story = [
-            Paragraph("IFG Zabbix Monitoring Issue Summary", centered_title),
-            Paragraph(f"Period: {get_shift_date_range(shift, first_date)}", centered_normal),
-            Paragraph(f"Created By: FDS Monitoring - {operator_name}", centered_normal),
-            Spacer(1, 12)
-        ]
-
-        def create_table(title, entries):
-            if not entries:
-                story.append(Paragraph(title, centered_heading))
-                story.append(Paragraph("Tidak ada masalah untuk kategori ini.", centered_normal))
-                story.append(Spacer(1, 12))
-                logging.info(f"No entries for problem category: {title}")
-                return
-            story.append(Paragraph(title, centered_heading))
-            table_data = [["Host", "Duration", "Time Start", "Ticket ID", "Status"]]
-            for entry in entries:
-                # Updated regex to match the correct format
-                match = re.match(
-                    r"- (.*?)  Durasi: (.*?) \(start (.*?)\) Ticket ID: (.*?) \*(.*?)\*",
-                    entry
-                )
-                if match:
-                    host, duration, start_time, ticket_id, status = match.groups()
-                    table_data.append([host, duration, start_time, ticket_id, status])
-                else:
-                    logging.error(f"Failed to parse table entry: {entry}")
-                    table_data.append([entry, "", "", "", "Parsing Error"])
-            table = Table(table_data, colWidths=[2*inch, 2*inch, 1.5*inch, 1*inch, 1*inch])
-            table.setStyle(TableStyle([
-                ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, -1), 9),
-                ("BOTTOMPADDING", (0, 0), (-1, 0), 6),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                ("WORDWRAP", (0, 0), (-1, -1), "CJK"),  # Support text wrapping
-            ]))
-            story.append(table)
-            story.append(Spacer(1, 12))
-
-        for problem in sorted(problem_groups.keys()):
-            create_table(problem, sorted(problem_groups[problem]))
-
-        doc.build(story)
-        messagebox.showinfo("Sukses", f"PDF berhasil disimpan di:\n{output_path}")
-        logging.info(f"PDF exported successfully to {output_path}")
-    except Exception as e:
-        logging.error(f"Failed to export PDF: {str(e)}")
-        messagebox.showerror("Error", f"Gagal mengekspor PDF: {str(e)}")
+    return os.path.join(output_folder, file_name)
 
 # Fungsi UI
 def create_styled_label(parent, text, font_size=12):
@@ -392,8 +1014,9 @@ def setup_recap_frame(frame, operator_name, kembali_callback):
         if files:
             files_var.clear()
             files_var.extend(files)
+            invalidate_recap_cache()
             status_label.config(text=f"{len(files)} file diunggah ✅", fg="green")
-            logging.info(f"Uploaded {len(files)} CSV files")
+            logger.info(f"Uploaded {len(files)} CSV files")
 
     btn_upload = ttkb.Button(input_frame, text="Unggah File", command=upload_files, bootstyle=INFO)
     btn_upload.grid(row=1, column=1, pady=5, padx=5)
@@ -405,6 +1028,13 @@ def setup_recap_frame(frame, operator_name, kembali_callback):
     shift_combobox = ttkb.Combobox(input_frame, textvariable=shift_var, values=["A", "C", "M", "D"], width=10)
     shift_combobox.grid(row=2, column=1, pady=5)
 
+    # Tanggal rekap: kosong = shift terakhir sampai sekarang; diisi untuk data/CSV hari sebelumnya
+    create_styled_label(input_frame, "📅 Tanggal (YYYY-MM-DD):").grid(row=3, column=0, sticky="w", padx=10, pady=5)
+    date_var = tk.StringVar(value="")
+    date_entry = ttkb.Entry(input_frame, textvariable=date_var, width=12)
+    date_entry.grid(row=3, column=1, pady=5)
+    create_tooltip(date_entry, "Kosongkan untuk shift terakhir sampai sekarang")
+
     report_frame = tk.Frame(scrollable_frame)
     report_frame.pack(pady=10)
     report_text = tk.Text(
@@ -426,129 +1056,194 @@ def setup_recap_frame(frame, operator_name, kembali_callback):
     button_frame = tk.Frame(scrollable_frame)
     button_frame.pack(pady=20)
     progress = ttkb.Progressbar(button_frame, mode="indeterminate", bootstyle=INFO)
+    progress_label = tk.Label(button_frame, text="", font=("Arial", 10))
+    current_job = {"job": None}
 
-    def generate_report():
-        progress.grid(row=1, column=0, columnspan=3, pady=5)
+    def show_progress():
+        progress.config(mode="indeterminate", value=0)
+        progress.grid(row=1, column=0, columnspan=4, pady=5)
+        progress_label.grid(row=2, column=0, columnspan=4)
         progress.start()
-        report_text.delete(1.0, tk.END)
-        
-        logging.info(f"Generating report with source: {data_source_var.get()}, shift: {shift_var.get()}")
-        
-        if data_source_var.get() == "API":
-            if fetch_zabbix_data is None:
-                status_label.config(text="❌ Modul zabbix_api.py tidak ditemukan!", fg="red")
-                progress.stop()
-                progress.grid_forget()
-                logging.error("Report generation failed: zabbix_api.py not found")
-                return
-            df = fetch_zabbix_data()
-            if df is None or df.empty:
-                status_label.config(text="❌ Gagal mengambil data dari API!", fg="red")
-                progress.stop()
-                progress.grid_forget()
-                logging.error("Report generation failed: No data from API")
-                return
-        else:
-            if not files_var:
-                status_label.config(text="❌ Silakan unggah file CSV!", fg="red")
-                progress.stop()
-                progress.grid_forget()
-                logging.error("Report generation failed: No CSV files selected")
-                return
-            try:
-                dfs = []
-                for file in files_var:
-                    logging.info(f"Reading CSV file: {file}")
-                    df = pd.read_csv(file, encoding="utf-8")
-                    df.columns = df.columns.str.strip()
-                    required_columns = {'Host', 'Time', 'Status', 'Duration', 'Problem', 'Tags'}
-                    if not required_columns.issubset(df.columns):
-                        status_label.config(
-                            text=f"Kolom berikut hilang di CSV: {required_columns - set(df.columns)}",
-                            fg="red"
-                        )
-                        progress.stop()
-                        progress.grid_forget()
-                        logging.error(f"Missing columns in CSV {file}: {required_columns - set(df.columns)}")
-                        return
-                    dfs.append(df)
-                df = pd.concat(dfs, ignore_index=True)
-                logging.info(f"Combined {len(dfs)} CSV files into DataFrame with {len(df)} rows")
-            except Exception as e:
-                status_label.config(text=f"Gagal membaca file CSV: {str(e)}", fg="red")
-                progress.stop()
-                progress.grid_forget()
-                logging.error(f"Failed to read CSV files: {str(e)}")
-                return
 
-        report, _ = analyze_data(df, shift_var.get(), operator_name)
-        if report:
-            report_text.insert(tk.END, report)
-            status_label.config(text="✅ Laporan berhasil dibuat", fg="green")
-            logging.info("Report generated successfully")
-        else:
-            status_label.config(text="⚠️ Tidak ada data yang memenuhi kriteria!", fg="orange")
-            logging.warning("No data met report criteria")
-        
+    def hide_progress():
         progress.stop()
         progress.grid_forget()
+        progress_label.grid_forget()
+        current_job["job"] = None
+        btn_generate.config(state="normal")
+        btn_export.config(state="normal")
+        btn_cancel.config(state="disabled")
 
-    def save_pdf():
-        progress.grid(row=1, column=0, columnspan=3, pady=5)
-        progress.start()
-        
-        logging.info(f"Exporting PDF with source: {data_source_var.get()}, shift: {shift_var.get()}")
-        
-        if data_source_var.get() == "API":
-            if fetch_zabbix_data is None:
-                status_label.config(text="❌ Modul zabbix_api.py tidak ditemukan!", fg="red")
+    def fail(message, log_message):
+        status_label.config(text=message, fg="red")
+        hide_progress()
+        logger.error(log_message)
+
+    def update_progress(job, stage, done, total):
+        """
+        Menampilkan tahap dan jumlah baris/langkah job; bar determinate jika total diketahui.
+        """
+        if total:
+            if str(progress.cget("mode")) != "determinate":
                 progress.stop()
-                progress.grid_forget()
-                logging.error("PDF export failed: zabbix_api.py not found")
-                return
-            df = fetch_zabbix_data()
+                progress.config(mode="determinate", maximum=total)
+            progress.config(value=done or 0)
+            progress_label.config(text=f"{stage}: {done or 0:,} / {total:,}")
+        else:
+            if str(progress.cget("mode")) != "indeterminate":
+                progress.config(mode="indeterminate")
+                progress.start()
+            progress_label.config(text=f"{stage}: {done:,}" if done is not None else f"{stage}...")
+
+    def load_data(job, action, source, files):
+        """
+        Memuat DataFrame dari sumber terpilih (dijalankan di worker), memakai cache jika
+        sumber/file tidak berubah. Mengembalikan (data_key, df); gagal -> JobFailed.
+        """
+        if source == "API":
+            if fetch_zabbix_data is None:
+                raise JobFailed("❌ Modul zabbix_api.py tidak ditemukan!", f"{action} failed: zabbix_api.py not found")
+        elif not files:
+            raise JobFailed("❌ Silakan unggah file CSV!", f"{action} failed: No CSV files selected")
+
+        try:
+            key = data_cache_key(source, files)
+        except OSError as e:
+            raise JobFailed(f"Gagal membaca file CSV: {str(e)}", f"Failed to stat CSV files: {str(e)}")
+        df = get_cached_data(key)
+        if df is not None:
+            logger.info(f"{action}: using cached data ({len(df)} rows)")
+            return key, df
+
+        if source == "API":
+            job.progress("Mengambil data dari API Zabbix")
+            df = fetch_zabbix_data(RECAP_SEVERITIES, incremental=True)
             if df is None or df.empty:
-                status_label.config(text="❌ Gagal mengambil data dari API!", fg="red")
-                progress.stop()
-                progress.grid_forget()
-                logging.error("PDF export failed: No data from API")
-                return
+                raise JobFailed("❌ Gagal mengambil data dari API!", f"{action} failed: No data from API")
+            job.progress("Data API diterima (baris)", len(df))
         else:
-            if not files_var:
-                status_label.config(text="❌ Silakan unggah file CSV!", fg="red")
-                progress.stop()
-                progress.grid_forget()
-                logging.error("PDF export failed: No CSV files selected")
-                return
             try:
-                dfs = []
-                for file in files_var:
-                    logging.info(f"Reading CSV file for PDF: {file}")
-                    df = pd.read_csv(file, encoding="utf-8")
-                    df.columns = df.columns.str.strip()
-                    required_columns = {'Host', 'Time', 'Status', 'Duration', 'Problem', 'Tags'}
-                    if not required_columns.issubset(df.columns):
-                        status_label.config(
-                            text=f"Kolom berikut hilang di CSV: {required_columns - set(df.columns)}",
-                            fg="red"
-                        )
-                        progress.stop()
-                        progress.grid_forget()
-                        logging.error(f"Missing columns in CSV {file}: {required_columns - set(df.columns)}")
-                        return
-                    dfs.append(df)
-                df = pd.concat(dfs, ignore_index=True)
-                logging.info(f"Combined {len(dfs)} CSV files for PDF with {len(df)} rows")
+                job.progress("Memeriksa header CSV")
+                df = ingest_csv_files(files, progress=job.progress)
+            except CsvSchemaError as e:
+                raise JobFailed(f"Kolom berikut hilang di CSV: {e.missing}", str(e))
+            except JobCancelled:
+                raise
             except Exception as e:
-                status_label.config(text=f"Gagal membaca file CSV: {str(e)}", fg="red")
-                progress.stop()
-                progress.grid_forget()
-                logging.error(f"Failed to read CSV files for PDF: {str(e)}")
+                raise JobFailed(f"Gagal membaca file CSV: {str(e)}", f"Failed to read CSV files: {str(e)}")
+        job.check()
+        store_data(key, df)
+        return key, df
+
+    def get_analysis(job, key, df, shift, reference=None):
+        now = data_loaded_at()
+        analysis_key = analysis_cache_key(key, shift, operator_name, reference, now)
+        result = get_cached_analysis(analysis_key)
+        if result is None:
+            result = analyze_data(df, shift, operator_name, reference=reference, progress=job.progress, now=now)
+            job.check()
+            store_analysis(analysis_key, result)
+        else:
+            logger.info("Using cached analysis result")
+        return result
+
+    def start_job(name, func, on_done):
+        """
+        Menjalankan func(job) di background; tombol aksi dinonaktifkan sampai selesai/cancel.
+        """
+        def on_error(job, error):
+            if isinstance(error, JobFailed):
+                fail(*error.args)
+            else:
+                fail(f"❌ Error: {str(error)}", f"{name} failed: {str(error)}")
+
+        def on_cancel(job):
+            status_label.config(text="⏹️ Proses dibatalkan", fg="orange")
+            hide_progress()
+
+        def on_finished(job, result):
+            hide_progress()
+            on_done(result)
+
+        show_progress()
+        btn_generate.config(state="disabled")
+        btn_export.config(state="disabled")
+        btn_cancel.config(state="normal")
+        status_label.config(text="⏳ Memproses...", fg="blue")
+        current_job["job"] = run_in_background(
+            progress, name, func, on_finished, on_error, on_progress=update_progress, on_cancel=on_cancel
+        )
+
+    def cancel_job():
+        if current_job["job"] is not None:
+            current_job["job"].cancel()
+
+    def get_reference():
+        """
+        Reference dari input tanggal; None jika kosong. Format salah -> pesan di status_label.
+        """
+        try:
+            return True, parse_reference_date(date_var.get())
+        except ValueError:
+            status_label.config(text="❌ Format tanggal harus YYYY-MM-DD", fg="red")
+            logger.error(f"Invalid reference date: {date_var.get()}")
+            return False, None
+
+    def generate_report():
+        report_text.delete(1.0, tk.END)
+        source, files, shift = data_source_var.get(), list(files_var), shift_var.get()
+        valid, reference = get_reference()
+        if not valid:
+            return
+        logger.info(f"Generating report with source: {source}, shift: {shift}, reference: {reference}")
+
+        # Generate Report dari API selalu menarik data terbaru
+        if source == "API":
+            invalidate_recap_cache()
+
+        def run(job):
+            key, df = load_data(job, "Report generation", source, files)
+            report, _ = get_analysis(job, key, df, shift, reference)
+            return report
+
+        def done(report):
+            if report:
+                report_text.insert(tk.END, report)
+                status_label.config(text="✅ Laporan berhasil dibuat", fg="green")
+                logger.info("Report generated successfully")
+            else:
+                status_label.config(text="⚠️ Tidak ada data yang memenuhi kriteria!", fg="orange")
+                logger.warning("No data met report criteria")
+
+        start_job("Report generation", run, done)
+
+    def save_pdf():
+        source, files, shift = data_source_var.get(), list(files_var), shift_var.get()
+        valid, reference = get_reference()
+        if not valid:
+            return
+        logger.info(f"Exporting PDF with source: {source}, shift: {shift}, reference: {reference}")
+
+        def run(job):
+            key, df = load_data(job, "PDF export", source, files)
+            report, problem_groups = get_analysis(job, key, df, shift, reference)
+            if not report:
+                return None
+            first_date = df.iloc[0]["Time"] if not df.empty else None
+            return render_pdf(problem_groups, shift, operator_name, get_period_date(shift, first_date, reference),
+                              pdf_output_path(), progress=job.progress)
+
+        def done(output_path):
+            if output_path is None:
+                status_label.config(text="⚠️ Tidak ada data yang memenuhi kriteria!", fg="orange")
+                messagebox.showwarning("Peringatan", "Tidak ada data yang memenuhi kriteria!")
+                logger.warning("No report generated for PDF export")
                 return
+            status_label.config(text="✅ PDF berhasil disimpan", fg="green")
+            messagebox.showinfo("Sukses", f"PDF berhasil disimpan di:\n{output_path}")
+            logger.info(f"PDF exported successfully to {output_path}")
 
-        export_to_pdf(df, shift_var.get(), operator_name)
-        progress.stop()
-        progress.grid_forget()
+        start_job("PDF export", run, done)
 
     btn_generate = ttkb.Button(
         button_frame,
@@ -568,13 +1263,23 @@ def setup_recap_frame(frame, operator_name, kembali_callback):
     btn_export.grid(row=0, column=1, padx=5)
     create_tooltip(btn_export, "Ekspor laporan ke PDF")
 
+    btn_cancel = ttkb.Button(
+        button_frame,
+        text="⏹️ Cancel",
+        command=cancel_job,
+        bootstyle=DANGER,
+        state="disabled"
+    )
+    btn_cancel.grid(row=0, column=2, padx=5)
+    create_tooltip(btn_cancel, "Batalkan proses yang sedang berjalan")
+
     btn_kembali = ttkb.Button(
         button_frame,
         text="🔙 Kembali",
         command=kembali_callback,
         bootstyle=SECONDARY
     )
-    btn_kembali.grid(row=0, column=2, padx=5)
+    btn_kembali.grid(row=0, column=3, padx=5)
     create_tooltip(btn_kembali, "Kembali ke menu utama")
 
     status_label = create_styled_label(scrollable_frame, "")
@@ -587,5 +1292,5 @@ if __name__ == "__main__":
     frame = tk.Frame(root)
     frame.pack(expand=True, fill=tk.BOTH)
     setup_recap_frame(frame, "armin", lambda: print("Kembali"))
-    logging.info("Application started")
+    logger.info("Application started")
     root.mainloop()
\ No newline at end of file
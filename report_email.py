@@ -11,12 +11,15 @@ from dotenv import load_dotenv
 import re
 import logging
 from tkinter import messagebox, filedialog
+from log_config import setup_logging
+
+logger = logging.getLogger(__name__)
 
 load_dotenv()
 EMAIL_PENGIRIM = os.getenv("EMAIL_PENGIRIM")
 PASSWORD_EMAIL = os.getenv("PASSWORD_EMAIL")
 
-logging.basicConfig(filename="app.log", level=logging.ERROR)
+setup_logging()
 
 def is_valid_email(email):
     pattern = r"^[a-zA-Z0.9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
@@ -154,16 +157,16 @@ def setup_email_frame(frame, operator_name, kembali_callback):
             status_label.config(text=f"✅ Email berhasil dikirim ke {to}", fg="green")
         except smtplib.SMTPAuthenticationError:
             status_label.config(text="❌ Kredensial email salah!", fg="red")
-            logging.error("Autentikasi gagal untuk %s", EMAIL_PENGIRIM)
+            logger.error("Autentikasi gagal untuk %s", EMAIL_PENGIRIM)
         except smtplib.SMTPException as e:
             status_label.config(text=f"❌ Error SMTP: {str(e)}", fg="red")
-            logging.error("Error SMTP: %s", str(e))
+            logger.error("Error SMTP: %s", str(e))
         except FileNotFoundError:
             status_label.config(text="❌ Lampiran tidak ditemukan!", fg="red")
-            logging.error("Lampiran tidak ditemukan: %s", attachment)
+            logger.error("Lampiran tidak ditemukan: %s", attachment)
         except Exception as e:
             status_label.config(text=f"❌ Gagal mengirim email: {str(e)}", fg="red")
-            logging.error("Gagal mengirim email: %s", str(e))
+            logger.error("Gagal mengirim email: %s", str(e))
         finally:
             progress.stop()
             progress.grid_forget()
@@ -0,0 +1,163 @@
+import os
+import time
+import pickle
+import logging
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Snapshot ringkas per laporan yang dibuat (EventID -> status open, waktu mulai, durasi) untuk
+# membandingkan satu shift dengan rekap sebelumnya. Satu file pickle kolumnar per shift dengan
+# nama "<mulai jendela YYYYmmddHHMM>_<shift>.pkl", sehingga rekap sebelumnya dicari dari nama
+# file saja tanpa membuka file lain. Perbandingan selalu dengan jendela sebelumnya (bukan jendela
+# yang sama), sehingga membuat ulang laporan shift yang sama - yang menimpa snapshot-nya setelah
+# dibandingkan - tetap menghasilkan diff yang sama.
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".pkl"
+
+class ShiftDiff:
+    """
+    Hasil perbandingan dengan rekap sebelumnya. new, resolved dan carried berisi tuple
+    (host, problem, open, duration_s, delta_s); open None dan delta_s None untuk problem yang
+    sebelumnya open tetapi tidak ada lagi di data rekap sekarang.
+    """
+    __slots__ = ("previous_shift", "previous_start", "new", "resolved", "carried")
+
+    def __init__(self, previous_shift, previous_start):
+        self.previous_shift = previous_shift
+        self.previous_start = previous_start
+        self.new = []
+        self.resolved = []
+        self.carried = []
+
+    def __len__(self):
+        return len(self.new) + len(self.resolved) + len(self.carried)
+
+def snapshot_name(shift, window_start):
+    return f"{window_start.strftime('%Y%m%d%H%M')}_{shift}{SNAPSHOT_SUFFIX}"
+
+def build_snapshot(records, shift, window_start):
+    """
+    Snapshot dari records analyze_data (kolom eventid, host, problem, zabbix_status, clock,
+    duration_s). EventID duplikat dibuang, baris terakhir yang dipakai.
+    """
+    if records is not None:
+        records = records.drop_duplicates("eventid", keep="last")
+    empty = records is None or records.empty
+    return {
+        "version": SNAPSHOT_VERSION,
+        "shift": shift,
+        "window_start": window_start,
+        "created": int(time.time()),
+        "eventid": [] if empty else records["eventid"].tolist(),
+        "host": [] if empty else records["host"].tolist(),
+        "problem": [] if empty else records["problem"].tolist(),
+        "open": np.zeros(0, bool) if empty else (records["zabbix_status"] == "PROBLEM").to_numpy(),
+        "clock": np.zeros(0, np.int64) if empty else records["clock"].fillna(-1).to_numpy(np.int64),
+        "duration_s": np.zeros(0, np.int64) if empty else records["duration_s"].to_numpy(np.int64)
+    }
+
+def save_snapshot(directory, snapshot):
+    """
+    Menulis snapshot secara atomik; mengembalikan path, atau None jika gagal.
+    """
+    path = os.path.join(directory, snapshot_name(snapshot["shift"], snapshot["window_start"]))
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump(snapshot, f, protocol=5)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.error(f"Failed to save snapshot {path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+    logger.info(f"Saved snapshot {path} ({len(snapshot['eventid'])} problems)")
+    return path
+
+def load_snapshot(path):
+    """
+    Memuat snapshot, atau None jika file tidak ada, rusak atau versinya berbeda.
+    """
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.error(f"Failed to load snapshot {path}: {e}")
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+        logger.warning(f"Ignoring snapshot {path} with unsupported version")
+        return None
+    return snapshot
+
+def find_previous_snapshot(directory, shift, window_start, previous_shift=None):
+    """
+    Path snapshot rekap sebelumnya: snapshot shift previous_shift (default: shift yang sama) yang
+    jendelanya mulai paling akhir sebelum jendela ini (urutan nama file), atau None jika belum ada.
+    """
+    current = snapshot_name(shift, window_start)
+    suffix = f"_{previous_shift or shift}{SNAPSHOT_SUFFIX}"
+    try:
+        names = [name for name in os.listdir(directory) if name.endswith(suffix) and name < current]
+    except FileNotFoundError:
+        return None
+    return os.path.join(directory, max(names)) if names else None
+
+def diff_snapshots(previous, current):
+    """
+    Membandingkan dua snapshot dalam satu lintasan per snapshot (lookup dict per EventID):
+    - new: ada di current, tidak ada di previous
+    - resolved: open di previous, resolved atau tidak ada lagi di current
+    - carried: open di previous dan masih open di current
+    Problem yang sudah resolved di previous dan muncul lagi di current tidak dilaporkan.
+    """
+    diff = ShiftDiff(previous["shift"], previous["window_start"])
+    prev_index = dict(zip(previous["eventid"], range(len(previous["eventid"]))))
+    prev_open = previous["open"].tolist()
+    prev_duration = previous["duration_s"].tolist()
+    cur_open = current["open"].tolist()
+    cur_duration = current["duration_s"].tolist()
+
+    seen = set()
+    for i, eventid in enumerate(current["eventid"]):
+        seen.add(eventid)
+        j = prev_index.get(eventid)
+        entry_delta = None if j is None else cur_duration[i] - prev_duration[j]
+        entry = (current["host"][i], current["problem"][i], cur_open[i], cur_duration[i], entry_delta)
+        if j is None:
+            diff.new.append(entry)
+        elif prev_open[j]:
+            (diff.carried if cur_open[i] else diff.resolved).append(entry)
+
+    for eventid, j in prev_index.items():
+        if prev_open[j] and eventid not in seen:
+            diff.resolved.append((previous["host"][j], previous["problem"][j], None, prev_duration[j], None))
+    return diff
+
+def compare_with_previous(directory, records, shift, window_start, previous_shift=None, save=True):
+    """
+    Membuat snapshot untuk laporan ini, membandingkannya dengan snapshot sebelumnya (lihat
+    find_previous_snapshot) lalu (jika save) menyimpannya. Mengembalikan ShiftDiff, atau None
+    jika belum ada rekap sebelumnya.
+    """
+    start = time.perf_counter()
+    current = build_snapshot(records, shift, window_start)
+    previous_path = find_previous_snapshot(directory, shift, window_start, previous_shift)
+    previous = load_snapshot(previous_path) if previous_path else None
+    diff = diff_snapshots(previous, current) if previous else None
+    if save:
+        save_snapshot(directory, current)
+    if diff is not None:
+        logger.info(
+            f"Diff against {previous_path}: {len(diff.new)} new, {len(diff.resolved)} resolved, "
+            f"{len(diff.carried)} carried over in {time.perf_counter() - start:.3f}s"
+        )
+    else:
+        logger.info(f"No previous snapshot for shift {shift} starting {window_start}")
+    return diff
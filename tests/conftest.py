@@ -0,0 +1,42 @@
+import os
+import sys
+
+import pytest
+
+# Modul aplikasi berada di root repo (bukan paket terpasang)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture(autouse=True, scope="session")
+def session_workdir(tmp_path_factory):
+    """
+    File log, cache dan database memakai path relatif; selama test semuanya ditulis ke
+    direktori sementara, bukan ke repo.
+    """
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("workdir"))
+    yield
+    os.chdir(cwd)
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+@pytest.fixture
+def mock_server(monkeypatch):
+    """
+    MockZabbixServer yang berjalan, dengan zabbix_api diarahkan ke server tersebut dan state
+    bersama (session, cache metadata, snapshot sinkronisasi) dikosongkan.
+    """
+    import zabbix_api
+    from mock_zabbix_server import MockZabbixServer
+
+    server = MockZabbixServer().start()
+    monkeypatch.setattr(zabbix_api, "ZABBIX_URL", server.url)
+    monkeypatch.setattr(zabbix_api, "METADATA_CACHE_FILE", None)
+    monkeypatch.setattr(zabbix_api, "_metadata_cache", None)
+    zabbix_api.reset_problem_snapshot()
+    yield server
+    zabbix_api.reset_problem_snapshot()
+    zabbix_api.close_session()
+    server.stop()
@@ -0,0 +1,99 @@
+import os
+
+import pandas as pd
+import pytest
+
+import recap_zabbix
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Akhir hari 17/10/2026: shift D = 17/10/2026 00:00 - 23:59, durasi open dihitung sampai 23:59:59
+REFERENCE = recap_zabbix.parse_reference_date("2026-10-17")
+
+# Export CSV dengan tiga format waktu, satu baris duplikat, status tidak valid, baris di luar
+# jendela, problem open sejak hari sebelumnya dan waktu yang tidak bisa di-parse
+ROWS = [
+    ("2026-10-17 08:15:00", "PROBLEM", "srv-db-01", "Space is critically low on /var (used > 95%)",
+     "15h 44m", "__zbx_jira_issuekey: IFG-1234", "101"),
+    ("2026-10-17 09:30:00 AM", "PROBLEM", "WIN-FS-02", "Windows: FS [C:]: Space is critically low (used > 90%)",
+     "14h 29m", "scope: capacity", "102"),
+    ("10/17/2026 13:05:00", "RESOLVED", "sw-core-01", "Interface Gi0/1: Link down",
+     "1h 2m", "__zbx_jira_issuekey=IFG-2000", "103"),
+    ("2026-10-17 08:15:00", "PROBLEM", "srv-db-01", "Space is critically low on /var (used > 95%)",
+     "15h 44m", "__zbx_jira_issuekey: IFG-1234", "101"),
+    ("2026-10-17 11:00:00", "UNKNOWN", "srv-web-01", "Linux: High CPU utilization (over 90% for 5m)",
+     "1h", "", "104"),
+    ("2026-10-15 10:00:00", "RESOLVED", "srv-web-02", "Linux: High CPU utilization (over 90% for 5m)",
+     "1h", "", "105"),
+    ("2026-10-16 22:00:00", "PROBLEM", "rtr-edge-01", "subslot 0/0 transceiver 3 Temperature high",
+     "1d 2h", "__zbx_jira_issuekey: IFG-3000", "106"),
+    ("not a time", "PROBLEM", "fw-dc-01", "ICMP: Unavailable by ICMP ping", "5m", "", "107"),
+]
+
+EXPECTED_REPORT = """\
+Selamat malam, berikut rekap daily problem Zabbix monitoring IFG
+17/10/2026 00:00 - 17/10/2026 23:59
+
+Interface Gi0/1: Link down
+- sw-core-01  Durasi: 0 menit (start 17/10/2026 13:05) Ticket ID: IFG-2000 *Resolved*
+
+Temperature Issue
+- rtr-edge-01  Durasi: 1 hari 1 jam 59 menit (start 16/10/2026 22:00) Ticket ID: IFG-3000 *Belum Resolved*
+
+Windows: Space is critically low
+- WIN-FS-02  Durasi: 14 jam 29 menit (start 17/10/2026 09:30) Ticket ID: IFG-Unknown *Belum Resolved*
+- srv-db-01  Durasi: 15 jam 44 menit (start 17/10/2026 08:15) Ticket ID: IFG-1234 *Belum Resolved*
+
+Terima kasih
+FDS Monitoring - tester"""
+
+@pytest.fixture(autouse=True)
+def problem_groups(monkeypatch):
+    monkeypatch.setattr(recap_zabbix, "PROBLEM_GROUPS_FILE", os.path.join(REPO_DIR, "problem_groups.json"))
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame(ROWS, columns=["Time", "Status", "Host", "Problem", "Duration", "Tags", "EventID"])
+
+def analyze(data, **kwargs):
+    return recap_zabbix.analyze_data(data, "D", "tester", reference=REFERENCE, save_artifacts=False, **kwargs)
+
+def test_report_text(frame):
+    report, problem_groups = analyze(frame)
+    assert report == EXPECTED_REPORT
+    assert sorted(problem_groups) == ["Interface Gi0/1: Link down", "Temperature Issue",
+                                      "Windows: Space is critically low"]
+
+def test_progress_chunks_give_same_report(frame, monkeypatch):
+    monkeypatch.setattr(recap_zabbix, "ANALYZE_CHUNK_ROWS", 2)
+    calls = []
+    report, _ = analyze(frame, progress=lambda stage, done, total: calls.append((done, total)))
+    assert report == EXPECTED_REPORT
+    assert calls[-1] == (calls[-1][1], calls[-1][1]) and len(calls) > 1
+
+def test_streamed_chunks_give_same_report(frame):
+    # Baris duplikat ada di potongan yang berbeda
+    report, _ = analyze(iter([frame.iloc[:3], frame.iloc[3:]]))
+    assert report == EXPECTED_REPORT
+
+def test_no_rows_in_window(frame):
+    report, problem_groups = recap_zabbix.analyze_data(
+        frame, "D", "tester", reference=recap_zabbix.parse_reference_date("2026-10-10"), save_artifacts=False
+    )
+    assert report == "" and problem_groups is None
+
+@pytest.mark.parametrize("shift, expected", [
+    # M 17/10 22:00 - 18/10 07:00: problem setelah tengah malam tetap berumur positif
+    ("M", ["- rtr-edge-01  Durasi: 5 jam (start 18/10/2026 02:00) Ticket ID: IFG-Unknown *Belum Resolved*",
+           "- srv-db-01  Durasi: 8 jam (start 17/10/2026 23:00) Ticket ID: IFG-Unknown *Belum Resolved*",
+           "- sw-core-01  Durasi: 1 hari (start 17/10/2026 07:00) Ticket ID: IFG-Unknown *Belum Resolved*"]),
+    # A 17/10 06:00 - 15:00: durasi sampai akhir shift, bukan akhir hari
+    ("A", ["- sw-core-01  Durasi: 8 jam (start 17/10/2026 07:00) Ticket ID: IFG-Unknown *Belum Resolved*"]),
+])
+def test_open_durations_aged_to_shift_end(shift, expected):
+    df = pd.DataFrame([
+        ("2026-10-17 07:00:00", "PROBLEM", "sw-core-01", "Link down", "1h", "", "1"),
+        ("2026-10-17 23:00:00", "PROBLEM", "srv-db-01", "Link down", "1h", "", "2"),
+        ("2026-10-18 02:00:00", "PROBLEM", "rtr-edge-01", "Link down", "1h", "", "3"),
+    ], columns=["Time", "Status", "Host", "Problem", "Duration", "Tags", "EventID"])
+    report, problem_groups = recap_zabbix.analyze_data(df, shift, "tester", reference=REFERENCE, save_artifacts=False)
+    assert problem_groups["Link down"].lines() == expected
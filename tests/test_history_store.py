@@ -0,0 +1,86 @@
+import time
+from contextlib import closing
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import recap_zabbix
+import zabbix_api
+from history_store import HistoryStore
+from mock_zabbix_server import generate_problems
+
+COLUMNS = ["eventid", "host", "clock", "problem", "group", "zabbix_status", "duration_s", "ticket_id"]
+
+def records(*rows):
+    return pd.DataFrame(list(rows), columns=COLUMNS)
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path / "history.db"))
+
+def statuses(store):
+    return {row["eventid"]: row["status"] for row in store.query()}
+
+def test_upsert_and_query(store):
+    first = store.save_run(records(
+        ("1", "srv-db-01", 100, "Disk full", "Disk", "PROBLEM", 60, "IFG-1"),
+        ("2", "srv-web-01", 200, "High CPU", "CPU", "PROBLEM", 30, "IFG-Unknown"),
+        ("3", "srv-db-01", 300, "High CPU", "CPU", "RESOLVED", 10, "IFG-2"),
+    ), "A", "tester", ["Invalid status: X (Host: h)"])
+    first_seen = store.query(host="srv-db-01", status="PROBLEM")[0]["first_seen"]
+
+    second = store.save_run(records(
+        ("1", "srv-db-01", 100, "Disk full", "Disk", "RESOLVED", 90, "IFG-1"),
+    ), "C", "tester")
+    assert second > first
+
+    row = store.query(ticket_id="IFG-1")[0]
+    assert (row["status"], row["duration_s"], row["shift"], row["first_seen"]) == ("RESOLVED", 90, "C", first_seen)
+    assert [r["eventid"] for r in store.problems_for_host("srv-db-01")] == ["3", "1"]
+    assert [r["eventid"] for r in store.query(group="CPU")] == ["3", "2"]
+    assert [r["eventid"] for r in store.query(since=150, until=300)] == ["2"]
+    assert [r["eventid"] for r in store.query(since=datetime.fromtimestamp(150), limit=1)] == ["3"]
+    assert [r["eventid"] for r in store.open_problems()] == ["2"]
+    assert store.filtered_problems(first) == ["Invalid status: X (Host: h)"]
+    assert store.filtered_problems(second) == []
+
+def test_resolve_missing_problems(store):
+    store.save_run(records(
+        ("1", "srv-db-01", 100, "Disk full", "Disk", "PROBLEM", 60, "IFG-1"),
+        ("2", "srv-web-01", 200, "High CPU", "CPU", "PROBLEM", 30, "IFG-2"),
+        ("3", "sw-core-01", 900, "Link down", "Link", "PROBLEM", 30, "IFG-3"),
+    ), "A", "tester")
+    # Hanya problem 1 yang masih aktif; problem 3 mulai setelah batas sehingga tidak disentuh
+    store.save_run(records(("1", "srv-db-01", 100, "Disk full", "Disk", "PROBLEM", 120, "IFG-1")),
+                   "C", "tester", resolve_missing_before=500)
+    assert statuses(store) == {"1": "PROBLEM", "2": "RESOLVED", "3": "PROBLEM"}
+
+    store.save_run(None, "M", "tester", resolve_missing_before=1000)
+    assert statuses(store) == {"1": "RESOLVED", "2": "RESOLVED", "3": "RESOLVED"}
+    with closing(store.connect()) as conn:
+        assert [tuple(r) for r in conn.execute("SELECT shift, problems FROM runs ORDER BY run_id")] == [
+            ("A", 3), ("C", 1), ("M", 0)
+        ]
+
+def test_api_runs_resolve_problems_gone_from_data(monkeypatch):
+    monkeypatch.setattr(recap_zabbix, "_history_store", None)
+    now = int(time.time())
+    problems = generate_problems(20, now=now, max_age=3600)
+    hosts = {p["eventid"]: p["host"] for p in problems}
+
+    def api_frame(active):
+        return zabbix_api.problems_to_frame(active, hosts, now)
+
+    recap_zabbix.analyze_data(api_frame(problems), "D", "tester")
+    store = recap_zabbix.get_history_store()
+    assert len(store.open_problems()) == 20
+
+    # Problem yang resolved di Zabbix tidak lagi dikembalikan problem.get
+    recap_zabbix.analyze_data(api_frame(problems[5:]), "D", "tester")
+    assert {r["eventid"] for r in store.open_problems()} == {p["eventid"] for p in problems[5:]}
+
+    # Run CSV tidak dianggap berisi semua problem aktif
+    csv_frame = api_frame(problems[10:]).drop(columns=["clock", "duration_s"])
+    recap_zabbix.analyze_data(csv_frame, "D", "tester")
+    assert len(store.open_problems()) == 15
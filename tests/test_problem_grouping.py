@@ -0,0 +1,72 @@
+import json
+
+import problem_grouping
+from problem_grouping import ProblemGrouper
+
+RULES = [
+    {"group": "Temperature Issue", "contains": ["subslot 0/0 transceiver", "Temperature"]},
+    {"group": "Disk", "regex": r"Space is (?:critically )?low"},
+    {"group": "Agent Down", "contains": ["Zabbix agent"], "regex": r"not available \(for \d+m\)"},
+    {"group": "Any Link", "regex": "Link"},
+]
+
+def test_rules_in_priority_order():
+    grouper = ProblemGrouper(RULES)
+    assert grouper.group("subslot 0/0 transceiver 3 Temperature high") == "Temperature Issue"
+    # Semua substring contains harus ada
+    assert grouper.group("subslot 0/0 transceiver 3 Power low") == "subslot 0/0 transceiver 3 Power low"
+    assert grouper.group("Windows: FS [C:]: Space is critically low (used > 90%)") == "Disk"
+    assert grouper.group("  Zabbix agent is not available (for 3m) ") == "Agent Down"
+    assert grouper.group("Zabbix agent is not available") == "Zabbix agent is not available"
+    assert grouper.group("Interface Gi0/1: Link down") == "Any Link"
+    assert grouper.memo_size() == 6
+
+def test_invalid_rules_are_skipped():
+    grouper = ProblemGrouper([
+        {"group": "No conditions"},
+        {"contains": ["Link"]},
+        {"group": "Broken", "regex": "("},
+        {"group": "Link", "contains": ["Link"]},
+    ])
+    assert grouper.groups == ["Link"]
+    assert grouper.group("Link down") == "Link"
+
+def test_rules_reusing_named_groups_are_rejected():
+    grouper = ProblemGrouper([
+        {"group": "Disk C", "regex": r"(?P<d>C):"},
+        {"group": "Disk D", "regex": r"(?P<d>D):"},
+        {"group": "Disk", "regex": r"[A-Z]:"},
+    ])
+    assert grouper.groups == ["Disk"]
+    assert grouper.group("FS [C:]: Space is low") == "Disk"
+
+def test_rules_with_backreferences_are_rejected():
+    grouper = ProblemGrouper([
+        {"group": "A", "regex": r"(x)\1"},
+        {"group": "B", "regex": r"(y)\1"},
+        {"group": "Double", "regex": r"(?:xx|yy)"},
+    ])
+    assert grouper.groups == ["Double"]
+    assert grouper.group("yy") == "Double"
+    assert grouper.group("xx") == "Double"
+
+def test_falls_back_to_per_rule_matching(monkeypatch):
+    # Pola yang lolos per aturan tetapi bentrok saat digabung (nama grup sama)
+    patterns = {"C": "(?=.*?(?P<d>C:))", "D": "(?=.*?(?P<d>D:))"}
+    monkeypatch.setattr(problem_grouping, "rule_pattern", lambda rule: patterns[rule["group"]])
+    grouper = ProblemGrouper([{"group": "C"}, {"group": "D"}])
+    assert grouper._matcher is None
+    assert grouper.group("FS [D:]") == "D"
+    assert grouper.group("FS [C:] and [D:]") == "C"
+    assert grouper.group("FS [E:]") == "FS [E:]"
+
+def test_load_rules_from_file(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(RULES[:1]), encoding="utf-8")
+    grouper = ProblemGrouper.from_file(str(path))
+    assert grouper.groups == ["Temperature Issue"]
+    assert grouper.signature == problem_grouping.rules_signature(str(path))
+
+    path.write_text("{not json", encoding="utf-8")
+    assert problem_grouping.load_rules(str(path)) == problem_grouping.DEFAULT_RULES
+    assert problem_grouping.load_rules(str(tmp_path / "missing.json")) == problem_grouping.DEFAULT_RULES
@@ -0,0 +1,52 @@
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+import recap_zabbix
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    recap_zabbix.invalidate_recap_cache()
+    yield
+    recap_zabbix.invalidate_recap_cache()
+
+def open_problem(start):
+    return pd.DataFrame([(start.strftime("%Y-%m-%d %H:%M:%S"), "PROBLEM", "srv-db-01", "Disk full", "1h", "", "1")],
+                        columns=["Time", "Status", "Host", "Problem", "Duration", "Tags", "EventID"])
+
+def test_durations_aged_to_data_time():
+    now = datetime.now().replace(microsecond=0) - timedelta(minutes=30)
+    df = open_problem(now - timedelta(hours=2))
+    report, _ = recap_zabbix.analyze_data(df, "D", "tester", save_artifacts=False, now=now)
+    assert "Durasi: 2 jam " in report
+    time.sleep(0.01)
+    assert recap_zabbix.analyze_data(df, "D", "tester", save_artifacts=False, now=now)[0] == report
+
+def test_analysis_reused_until_data_reloaded():
+    key = recap_zabbix.data_cache_key("API", [])
+    df = open_problem(datetime.now() - timedelta(hours=1))
+    recap_zabbix.store_data(key, df)
+    loaded = recap_zabbix.data_loaded_at()
+    analysis_key = recap_zabbix.analysis_cache_key(key, "D", "tester", None, loaded)
+    recap_zabbix.store_analysis(analysis_key, ("report", None))
+
+    # Export di menit lain tetap memakai hasil yang sama selama data belum dimuat ulang
+    time.sleep(0.01)
+    assert recap_zabbix.get_cached_data(key) is df
+    same_key = recap_zabbix.analysis_cache_key(key, "D", "tester", None, recap_zabbix.data_loaded_at())
+    assert recap_zabbix.get_cached_analysis(same_key) == ("report", None)
+    assert recap_zabbix.get_cached_analysis(recap_zabbix.analysis_cache_key(key, "A", "tester", None, loaded)) is None
+
+    recap_zabbix.store_data(key, df)
+    assert recap_zabbix.get_cached_analysis(same_key) is None
+
+def test_api_data_expires(monkeypatch):
+    api_key = recap_zabbix.data_cache_key("API", [])
+    recap_zabbix.store_data(api_key, open_problem(datetime.now()))
+    assert recap_zabbix.get_cached_data(api_key) is not None
+    monkeypatch.setitem(
+        recap_zabbix._data_cache, "loaded", datetime.now() - timedelta(seconds=recap_zabbix.API_DATA_TTL + 1)
+    )
+    assert recap_zabbix.get_cached_data(api_key) is None
@@ -0,0 +1,93 @@
+import os
+import pickle
+from datetime import datetime
+
+import pandas as pd
+
+import shift_diff
+
+COLUMNS = ["eventid", "host", "problem", "zabbix_status", "clock", "duration_s"]
+
+def records(*rows):
+    return pd.DataFrame(list(rows), columns=COLUMNS)
+
+PREVIOUS = records(
+    ("1", "srv-db-01", "Disk full", "PROBLEM", 1000, 600),
+    ("2", "srv-web-01", "High CPU", "PROBLEM", 1100, 500),
+    ("3", "sw-core-01", "Link down", "PROBLEM", 1200, 400),
+    ("4", "fw-dc-01", "ICMP down", "RESOLVED", 1300, 60),
+)
+CURRENT = records(
+    ("1", "srv-db-01", "Disk full", "PROBLEM", 1000, 3600),
+    ("2", "srv-web-01", "High CPU", "RESOLVED", 1100, 900),
+    ("4", "fw-dc-01", "ICMP down", "PROBLEM", 1300, 3000),
+    ("5", "rtr-edge-01", "Temperature high", "PROBLEM", 3000, 200),
+)
+A_START = datetime(2026, 10, 17, 6)
+C_START = datetime(2026, 10, 17, 14)
+
+def test_diff_snapshots():
+    diff = shift_diff.diff_snapshots(
+        shift_diff.build_snapshot(PREVIOUS, "A", A_START), shift_diff.build_snapshot(CURRENT, "C", C_START)
+    )
+    assert (diff.previous_shift, diff.previous_start) == ("A", A_START)
+    assert diff.new == [("rtr-edge-01", "Temperature high", True, 200, None)]
+    assert diff.carried == [("srv-db-01", "Disk full", True, 3600, 3000)]
+    # Resolved di data sekarang, lalu open di rekap sebelumnya tetapi tidak ada lagi di data
+    assert diff.resolved == [
+        ("srv-web-01", "High CPU", False, 900, 400),
+        ("sw-core-01", "Link down", None, 400, None),
+    ]
+    # EventID 4 sudah resolved sebelumnya lalu open lagi: tidak dilaporkan
+    assert len(diff) == 4
+
+def test_build_snapshot_drops_duplicates_and_handles_empty():
+    later = records(("1", "srv-db-01", "Disk full", "RESOLVED", 1000, 700))
+    snapshot = shift_diff.build_snapshot(pd.concat([PREVIOUS, later]), "A", A_START)
+    # Baris terakhir per EventID yang dipakai
+    by_eventid = dict(zip(snapshot["eventid"], zip(snapshot["open"].tolist(), snapshot["duration_s"].tolist())))
+    assert by_eventid == {"1": (False, 700), "2": (True, 500), "3": (True, 400), "4": (False, 60)}
+
+    empty = shift_diff.build_snapshot(None, "A", A_START)
+    assert empty["eventid"] == [] and len(empty["duration_s"]) == 0
+    assert len(shift_diff.diff_snapshots(empty, shift_diff.build_snapshot(CURRENT, "C", C_START)).new) == 4
+
+def test_snapshot_round_trip_and_bad_files(tmp_path):
+    snapshot = shift_diff.build_snapshot(PREVIOUS, "A", A_START)
+    path = shift_diff.save_snapshot(str(tmp_path), snapshot)
+    assert os.path.basename(path) == "202610170600_A.pkl"
+    loaded = shift_diff.load_snapshot(path)
+    assert loaded["eventid"] == snapshot["eventid"]
+    assert loaded["duration_s"].tolist() == snapshot["duration_s"].tolist()
+
+    assert shift_diff.load_snapshot(str(tmp_path / "missing.pkl")) is None
+    (tmp_path / "broken.pkl").write_bytes(b"not a pickle")
+    assert shift_diff.load_snapshot(str(tmp_path / "broken.pkl")) is None
+    with open(tmp_path / "old.pkl", "wb") as f:
+        pickle.dump(dict(snapshot, version=0), f)
+    assert shift_diff.load_snapshot(str(tmp_path / "old.pkl")) is None
+
+def test_find_previous_snapshot_filters_by_shift(tmp_path):
+    directory = str(tmp_path)
+    assert shift_diff.find_previous_snapshot(directory, "C", C_START, "A") is None
+    for shift, start in (("M", datetime(2026, 10, 16, 22)), ("A", datetime(2026, 10, 16, 6)),
+                         ("A", A_START), ("D", datetime(2026, 10, 17))):
+        shift_diff.save_snapshot(directory, shift_diff.build_snapshot(PREVIOUS, shift, start))
+
+    assert shift_diff.find_previous_snapshot(directory, "C", C_START, "A").endswith("202610170600_A.pkl")
+    assert shift_diff.find_previous_snapshot(directory, "A", A_START, "M").endswith("202610162200_M.pkl")
+    # Tanpa previous_shift: snapshot shift yang sama sebelum jendela ini (bukan jendela ini sendiri)
+    assert shift_diff.find_previous_snapshot(directory, "A", A_START).endswith("202610160600_A.pkl")
+    assert shift_diff.find_previous_snapshot(directory, "D", datetime(2026, 10, 17)) is None
+
+def test_rerun_gives_same_diff(tmp_path):
+    directory = str(tmp_path)
+    assert shift_diff.compare_with_previous(directory, PREVIOUS, "A", A_START, "M") is None
+    first = shift_diff.compare_with_previous(directory, CURRENT, "C", C_START, "A")
+    # Membuat ulang rekap C menimpa snapshot C, tetapi tetap dibandingkan dengan A
+    again = shift_diff.compare_with_previous(directory, CURRENT, "C", C_START, "A")
+    assert (again.new, again.resolved, again.carried) == (first.new, first.resolved, first.carried)
+    assert sorted(os.listdir(directory)) == ["202610170600_A.pkl", "202610171400_C.pkl"]
+
+    shift_diff.compare_with_previous(directory, PREVIOUS, "C", datetime(2026, 10, 18, 14), "A", save=False)
+    assert len(os.listdir(directory)) == 2
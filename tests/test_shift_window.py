@@ -0,0 +1,78 @@
+import random
+from contextlib import closing
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+import recap_zabbix
+
+@pytest.mark.parametrize("shift, reference, expected", [
+    ("A", datetime(2026, 10, 17, 10, 0), (datetime(2026, 10, 17, 6), datetime(2026, 10, 17, 15))),
+    ("A", datetime(2026, 10, 17, 5, 59), (datetime(2026, 10, 16, 6), datetime(2026, 10, 16, 15))),
+    ("C", datetime(2026, 10, 17, 10, 0), (datetime(2026, 10, 16, 14), datetime(2026, 10, 16, 23))),
+    ("M", datetime(2026, 10, 17, 10, 0), (datetime(2026, 10, 16, 22), datetime(2026, 10, 17, 7))),
+    ("M", datetime(2026, 10, 17, 23, 59, 59), (datetime(2026, 10, 17, 22), datetime(2026, 10, 18, 7))),
+    ("D", datetime(2026, 10, 17, 10, 0),
+     (datetime(2026, 10, 17), datetime(2026, 10, 17, 23, 59, 59, 999999))),
+])
+def test_get_shift_window(shift, reference, expected):
+    assert recap_zabbix.get_shift_window(shift, reference) == expected
+
+def test_unknown_shift_has_no_window():
+    assert recap_zabbix.get_shift_window("X", datetime(2026, 10, 17)) is None
+
+def test_parse_reference_date():
+    assert recap_zabbix.parse_reference_date("") is None
+    assert recap_zabbix.parse_reference_date(None) is None
+    assert recap_zabbix.parse_reference_date(" 2026-10-17 ") == datetime(2026, 10, 17, 23, 59, 59)
+    with pytest.raises(ValueError):
+        recap_zabbix.parse_reference_date("17/10/2026")
+
+def random_frame(count, seed=1):
+    rng = random.Random(seed)
+    base = datetime(2026, 10, 14)
+    rows = []
+    for _ in range(count):
+        start = base + timedelta(minutes=rng.randrange(5 * 1440))
+        minutes = rng.randrange(3 * 1440)
+        rows.append((
+            start.strftime("%Y-%m-%d %H:%M:%S"),
+            rng.choice(["PROBLEM", "RESOLVED"]),
+            f"{minutes // 60}h {minutes % 60}m",
+        ))
+    rows[5] = ("tidak valid", "PROBLEM", "1h")
+    return pd.DataFrame(rows, columns=["Time", "Status", "Duration"], index=range(100, 100 + count))
+
+@pytest.mark.parametrize("shift", ["A", "C", "M", "D"])
+def test_select_shift_rows_matches_brute_force(shift):
+    df = random_frame(2000)
+    window_start, window_end = recap_zabbix.get_shift_window(shift, datetime(2026, 10, 16, 23, 59, 59))
+
+    starts = pd.to_datetime(df["Time"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
+    ends = starts + pd.to_timedelta(df["Duration"].map(recap_zabbix.parse_duration), unit="s")
+    overlaps = (starts <= window_end) & ((df["Status"] == "PROBLEM") | (ends >= window_start))
+
+    selected = recap_zabbix.select_shift_rows(df, window_start, window_end)
+    # Urutan baris asli dipertahankan; baris tanpa waktu valid tidak pernah terpilih
+    assert 0 < len(selected) < len(df)
+    assert list(selected.index) == list(df.index[overlaps])
+    assert 105 not in selected.index
+
+def test_unparsed_rows_recorded_as_filtered(monkeypatch):
+    monkeypatch.setattr(recap_zabbix, "_history_store", None)
+    df = pd.DataFrame([
+        ("2026-10-17 08:15:00", "PROBLEM", "srv-db-01", "Linux: High CPU utilization", "1h", "", "1"),
+        ("kemarin sore", "PROBLEM", "fw-dc-01", "ICMP: Unavailable by ICMP ping", "5m", "", "2"),
+    ], columns=["Time", "Status", "Host", "Problem", "Duration", "Tags", "EventID"])
+
+    assert len(recap_zabbix.unparsed_time_rows(df)) == 1
+    report, _ = recap_zabbix.analyze_data(
+        df, "D", "tester", reference=recap_zabbix.parse_reference_date("2026-10-17")
+    )
+    assert "srv-db-01" in report and "fw-dc-01" not in report
+
+    store = recap_zabbix.get_history_store()
+    with closing(store.connect()) as conn:
+        run_id = conn.execute("SELECT max(run_id) FROM runs").fetchone()[0]
+    assert store.filtered_problems(run_id) == ["Invalid time: ICMP: Unavailable by ICMP ping (Host: fw-dc-01)"]
@@ -0,0 +1,57 @@
+import time
+
+import zabbix_api
+from mock_zabbix_server import generate_problems
+
+# Kolom yang bergantung pada waktu pengambilan (durasi sampai "sekarang")
+VOLATILE_COLUMNS = ["Duration", "duration_s"]
+
+def stable(df):
+    return df.drop(columns=VOLATILE_COLUMNS).reset_index(drop=True)
+
+def test_multi_severity_single_request(mock_server):
+    problems = generate_problems(400, max_age=86400)
+    mock_server.add_problems(problems)
+    expected = {p["eventid"] for p in problems if p["severity"] in ("4", "5")}
+
+    df = zabbix_api.fetch_zabbix_data([4, 5])
+    assert mock_server.method_counts["problem.get"] == 1
+    assert set(df["EventID"]) == expected
+    assert set(df["Severity"]) == {"4", "5"}
+
+    mock_server.reset_counts()
+    fanned = zabbix_api.fetch_zabbix_data(range(4, 6), fan_out=True)
+    assert mock_server.method_counts["problem.get"] == 2
+    assert stable(fanned).equals(stable(df))
+
+def test_incremental_sync_matches_full_fetch(mock_server):
+    problems = generate_problems(300, max_age=86400)
+    mock_server.add_problems(problems)
+    first = zabbix_api.fetch_zabbix_data([4, 5], incremental=True)
+    full_sync = zabbix_api._snapshots["4,5"]["full_sync"]
+
+    # Sebagian problem resolved dan problem baru muncul setelah sinkronisasi pertama
+    resolved = list(first["EventID"][::7])
+    for eventid in resolved:
+        mock_server.resolve(eventid)
+    added = generate_problems(40, seed=7, now=time.time() + 3600, max_age=600, first_eventid=500000)
+    mock_server.add_problems(added)
+
+    mock_server.reset_counts()
+    synced = zabbix_api.fetch_zabbix_data([4, 5], incremental=True)
+    # Delta: problem baru + event recovery, lalu cek kandidat resolved + host problem baru
+    assert zabbix_api._snapshots["4,5"]["full_sync"] == full_sync
+    assert mock_server.request_count == 2
+
+    expected = zabbix_api.fetch_zabbix_data([4, 5])
+    assert not set(resolved) & set(synced["EventID"])
+    assert {p["eventid"] for p in added if p["severity"] in ("4", "5")} <= set(synced["EventID"])
+    assert stable(synced).equals(stable(expected))
+
+def test_sync_without_changes_keeps_snapshot(mock_server):
+    mock_server.add_problems(generate_problems(100, max_age=86400))
+    first = zabbix_api.fetch_zabbix_data(4, incremental=True)
+    mock_server.reset_counts()
+    again = zabbix_api.fetch_zabbix_data(4, incremental=True)
+    assert mock_server.request_count == 1
+    assert stable(again).equals(stable(first))
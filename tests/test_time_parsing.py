@@ -0,0 +1,73 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import recap_zabbix
+from recap_zabbix import CALC_DATE_FORMATS, DISPLAY_DATE_FORMATS
+
+@pytest.fixture(autouse=True)
+def empty_format_cache(monkeypatch):
+    monkeypatch.setattr(recap_zabbix, "_time_format_cache", {})
+
+def test_infer_time_format_caches_by_shape():
+    assert recap_zabbix.infer_time_format("2026-10-17 08:15:00", CALC_DATE_FORMATS) == "%Y-%m-%d %H:%M:%S"
+    # String lain dengan bentuk yang sama langsung memakai format ter-cache
+    key = ("0000-00-00 00:00:00", CALC_DATE_FORMATS)
+    assert recap_zabbix._time_format_cache[key] == "%Y-%m-%d %H:%M:%S"
+    assert recap_zabbix.infer_time_format("2025-01-02 13:00:00", CALC_DATE_FORMATS) == "%Y-%m-%d %H:%M:%S"
+    assert recap_zabbix.infer_time_format("kemarin", CALC_DATE_FORMATS) is None
+
+@pytest.mark.parametrize("value, expected", [
+    ("2026-10-17 09:30:00 PM", datetime(2026, 10, 17, 21, 30)),
+    ("2026-10-17 21:30:00", datetime(2026, 10, 17, 21, 30)),
+    ("10/17/2026 21:30:00", datetime(2026, 10, 17, 21, 30)),
+    ("2026/10/17 21:30", datetime(2026, 10, 17, 21, 30)),
+    ("17-Oct-2026 21:30", datetime(2026, 10, 17, 21, 30)),
+    ("2026-13-17 21:30:00", None),
+    ("", None),
+])
+def test_parse_timestamp(value, expected):
+    assert recap_zabbix.parse_timestamp(value, DISPLAY_DATE_FORMATS) == expected
+
+def test_parse_time_column_mixed_formats_and_outliers():
+    series = pd.Series([
+        "2026-10-17 08:15:00", "2026-10-17 09:15:00", "10/17/2026 13:05:00",
+        "2026-10-17 09:30:00 AM", "2026-02-30 10:00:00", None, "2026-10-17 10:15:00",
+    ])
+    parsed = recap_zabbix.parse_time_column(series, CALC_DATE_FORMATS)
+    expected = pd.Series(pd.to_datetime([
+        "2026-10-17 08:15:00", "2026-10-17 09:15:00", "2026-10-17 13:05:00",
+        "2026-10-17 09:30:00", None, None, "2026-10-17 10:15:00",
+    ]))
+    pd.testing.assert_series_equal(parsed, expected.astype(parsed.dtype), check_names=False)
+
+def test_parse_time_column_keeps_index():
+    series = pd.Series(["10/17/2026 13:05:00", "2026-10-17 08:15:00"], index=[7, 3])
+    parsed = recap_zabbix.parse_time_column(series, CALC_DATE_FORMATS)
+    assert list(parsed.index) == [7, 3]
+    assert list(parsed) == [pd.Timestamp("2026-10-17 13:05"), pd.Timestamp("2026-10-17 08:15")]
+
+def test_format_date():
+    assert recap_zabbix.format_date("2026-10-17 09:30:00 PM") == "17/10/2026 21:30"
+    assert recap_zabbix.format_date("bukan waktu") == "bukan waktu"
+
+@pytest.mark.parametrize("text, seconds", [
+    ("2d 3h 4m", 2 * 86400 + 3 * 3600 + 4 * 60),
+    ("3h 4m", 3 * 3600 + 4 * 60),
+    ("4m 5s", 4 * 60 + 5),
+    ("1m 2d 3h", 30 * 86400 + 2 * 86400 + 3 * 3600),
+    ("1y 2m", 365 * 86400 + 2 * 30 * 86400),
+    ("1 bulan 2 hari 3 jam 4 menit", 30 * 86400 + 2 * 86400 + 3 * 3600 + 4 * 60),
+    ("15h 44m 12s", 15 * 3600 + 44 * 60 + 12),
+    ("", 0),
+])
+def test_parse_duration(text, seconds):
+    assert recap_zabbix.parse_duration(text) == seconds
+
+def test_format_duration():
+    assert recap_zabbix.format_duration(0) == "0 menit"
+    assert recap_zabbix.format_duration(59) == "0 menit"
+    assert recap_zabbix.format_duration(93599) == "1 hari 1 jam 59 menit"
+    assert recap_zabbix.format_duration(31 * 86400 + 60) == "1 bulan 1 hari 1 menit"
+    assert recap_zabbix.format_duration(-3600) == "0 menit"
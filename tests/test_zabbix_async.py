@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+import zabbix_api
+import zabbix_async
+from mock_zabbix_server import generate_problems
+
+# Kolom yang bergantung pada waktu pengambilan (durasi sampai "sekarang")
+VOLATILE_COLUMNS = ["Duration", "duration_s"]
+
+def test_fan_out_matches_sync_fetch(mock_server, monkeypatch):
+    mock_server.add_problems(generate_problems(600, max_age=86400))
+    monkeypatch.setattr(zabbix_async, "HOST_BATCH_SIZE", 50)
+
+    df = asyncio.run(zabbix_async.fetch_zabbix_data([4, 5], fan_out=True, concurrency=12))
+    assert mock_server.method_counts["problem.get"] == 2
+    host_batches = mock_server.method_counts["event.get"]
+    assert host_batches == -(-len(df) // 50)
+
+    monkeypatch.setattr(zabbix_api, "_metadata_cache", None)
+    expected = zabbix_api.fetch_zabbix_data([4, 5])
+    assert df.drop(columns=VOLATILE_COLUMNS).equals(expected.drop(columns=VOLATILE_COLUMNS))
+
+def test_fan_out_runs_requests_concurrently(mock_server, monkeypatch):
+    mock_server.add_problems(generate_problems(600, max_age=86400))
+    mock_server.latency = 0.1
+    monkeypatch.setattr(zabbix_async, "HOST_BATCH_SIZE", 10)
+    concurrency = zabbix_api.API_POOL_SIZE
+
+    start = time.perf_counter()
+    df = asyncio.run(zabbix_async.fetch_zabbix_data([4, 5], fan_out=True, concurrency=concurrency))
+    elapsed = time.perf_counter() - start
+
+    requests = mock_server.request_count
+    assert len(df) and requests > 2 * concurrency
+    # Berurutan butuh requests * latency; dengan request bersamaan jauh lebih cepat
+    assert elapsed < requests * mock_server.latency / 3
+
+def test_executor_grows_with_concurrency(monkeypatch):
+    monkeypatch.setattr(zabbix_async, "_executor", None)
+    monkeypatch.setattr(zabbix_async, "_executor_size", 0)
+    small = zabbix_async._get_executor()
+    assert zabbix_async._executor_size == zabbix_async.ASYNC_CONCURRENCY
+    assert zabbix_async._get_executor(2) is small
+
+    large = zabbix_async._get_executor(zabbix_async.ASYNC_CONCURRENCY * 2)
+    assert large is not small
+    assert large._max_workers == zabbix_async.ASYNC_CONCURRENCY * 2
+    assert zabbix_async._get_executor() is large
+    large.shutdown()
@@ -1,15 +1,20 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
 from datetime import datetime
 import time
+import random
+import threading
+import atexit
+from concurrent.futures import ThreadPoolExecutor
 import logging
+from metadata_cache import MetadataCache
+from log_config import setup_logging, sampled_debug
+
+logger = logging.getLogger(__name__)
 
 # Konfigurasi Logging
-logging.basicConfig(
-    filename="zabbix_api.log",
-    level=logging.DEBUG,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
+setup_logging()
 
 # Konfigurasi Zabbix API
 ZABBIX_URL = ""
@@ -17,151 +22,627 @@ ZABBIX_API_TOKEN = ""
 
 HEADERS = {
     "Content-Type": "application/json",
+    "Accept-Encoding": "gzip, deflate",
     "Authorization": f"Bearer {ZABBIX_API_TOKEN}"
 }
 
+# Konfigurasi koneksi HTTP
+API_TIMEOUT = 10
+API_POOL_SIZE = 10
+API_MAX_RETRIES = 3
+API_BACKOFF_BASE = 0.5
+API_BACKOFF_MAX = 8.0
+API_PAGE_SIZE = 1000
+
+# Konfigurasi cache metadata (host per event); METADATA_CACHE_FILE = None mematikan persistensi
+METADATA_CACHE_TTL = 12 * 3600
+METADATA_CACHE_SIZE = 50000
+METADATA_CACHE_FILE = "zabbix_metadata_cache.json"
+
+# Konfigurasi sinkronisasi inkremental
+SYNC_FULL_INTERVAL = 1800
+SYNC_RECOVERY_OVERLAP = 60
+
+_session = None
+_session_lock = threading.Lock()
+_api_stats = {}
+_stats_lock = threading.Lock()
+_snapshots = {}
+_snapshot_lock = threading.Lock()
+_metadata_cache = None
+_metadata_cache_lock = threading.Lock()
+
+def get_metadata_cache():
+    """
+    Mengembalikan cache metadata bersama; dimuat dari METADATA_CACHE_FILE pada pemakaian pertama
+    dan disimpan kembali saat aplikasi keluar.
+    """
+    global _metadata_cache
+    with _metadata_cache_lock:
+        if _metadata_cache is None:
+            cache = MetadataCache(ttl=METADATA_CACHE_TTL, max_size=METADATA_CACHE_SIZE, path=METADATA_CACHE_FILE)
+            cache.load()
+            atexit.register(cache.save)
+            _metadata_cache = cache
+        return _metadata_cache
+
+def get_session():
+    """
+    Mengembalikan requests.Session bersama (keep-alive) dengan pool koneksi sebesar API_POOL_SIZE.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=API_POOL_SIZE, pool_maxsize=API_POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(HEADERS)
+            _session = session
+            logger.debug(f"Created HTTP session with pool size {API_POOL_SIZE}")
+        return _session
+
+def close_session():
+    """
+    Menutup session bersama; panggilan berikutnya akan membuat session baru.
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+def _record_stats(method, elapsed, retries, failed):
+    with _stats_lock:
+        stats = _api_stats.setdefault(
+            method, {"calls": 0, "retries": 0, "errors": 0, "total_time": 0.0, "max_time": 0.0}
+        )
+        stats["calls"] += 1
+        stats["retries"] += retries
+        stats["errors"] += int(failed)
+        stats["total_time"] += elapsed
+        stats["max_time"] = max(stats["max_time"], elapsed)
+
+def get_api_stats():
+    """
+    Mengembalikan salinan statistik per method: calls, retries, errors, total_time, max_time, avg_time.
+    """
+    with _stats_lock:
+        result = {}
+        for method, stats in _api_stats.items():
+            result[method] = dict(stats, avg_time=stats["total_time"] / stats["calls"] if stats["calls"] else 0.0)
+        return result
+
+def reset_api_stats():
+    with _stats_lock:
+        _api_stats.clear()
+
+def _backoff_delay(attempt):
+    """
+    Exponential backoff dengan full jitter.
+    """
+    return random.uniform(0, min(API_BACKOFF_MAX, API_BACKOFF_BASE * (2 ** attempt)))
+
+def _is_retryable(exc):
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code in (429, 502, 503, 504)
+    return False
+
+def _post(body, label, max_retries):
+    """
+    Mengirim body JSON lewat session bersama dengan retry untuk error transien.
+    Mengembalikan (json_response, jumlah_retry); exception diteruskan ke pemanggil.
+    """
+    session = get_session()
+    attempt = 0
+    while True:
+        try:
+            response = session.post(ZABBIX_URL, data=json.dumps(body), timeout=API_TIMEOUT)
+            response.raise_for_status()
+            return response.json(), attempt
+        except Exception as e:
+            if attempt >= max_retries or not _is_retryable(e):
+                e.retries = attempt
+                raise
+            delay = _backoff_delay(attempt)
+            attempt += 1
+            logger.warning(f"Retrying {label} ({attempt}/{max_retries}) in {delay:.2f}s: {e}")
+            time.sleep(delay)
+
 def call_api(payload):
     """
     Mengirim permintaan ke Zabbix API dan mengembalikan hasilnya.
+    Method *.get (idempoten) diulang dengan exponential backoff saat terjadi error transien.
     """
+    method = payload.get("method", "unknown")
+    max_retries = API_MAX_RETRIES if method.endswith(".get") else 0
+    start = time.perf_counter()
+    attempt = 0
     try:
-        response = requests.post(ZABBIX_URL, headers=HEADERS, data=json.dumps(payload), timeout=10)
-        response.raise_for_status()
-        result = response.json()
+        result, attempt = _post(payload, method, max_retries)
         if "error" in result:
-            logging.error(f"Zabbix API Error: {result['error']}")
+            logger.error(f"Zabbix API Error: {result['error']}")
             raise Exception(f"Zabbix API Error: {result['error']}")
-        logging.debug(f"API call successful: {payload['method']}")
+        logger.debug(f"API call successful: {method}")
+        _record_stats(method, time.perf_counter() - start, attempt, False)
         return result["result"]
     except Exception as e:
-        logging.error(f"API call failed: {e}")
+        logger.error(f"API call failed: {e}")
+        _record_stats(method, time.perf_counter() - start, getattr(e, "retries", attempt), True)
         return None
 
-def get_active_high_problems(severity=4):
+def call_api_batch(payloads):
     """
-    Mengambil masalah aktif dengan severity tertentu dari Zabbix.
+    Mengirim beberapa payload sebagai satu JSON-RPC batch (satu POST).
+    Setiap payload diberi id sesuai urutannya dan respons dicocokkan kembali lewat id.
+    Mengembalikan list {"result": ..., "error": ...} sesuai urutan payload, atau None
+    jika seluruh request gagal. Error per item tidak menggagalkan item lain.
+    """
+    if not payloads:
+        return []
+    body = [dict(payload, jsonrpc="2.0", id=i) for i, payload in enumerate(payloads)]
+    methods = [payload.get("method", "unknown") for payload in payloads]
+    label = f"batch[{','.join(methods)}]"
+    max_retries = API_MAX_RETRIES if all(m.endswith(".get") for m in methods) else 0
+    start = time.perf_counter()
+    attempt = 0
+    try:
+        response, attempt = _post(body, label, max_retries)
+        if isinstance(response, dict):
+            # Server menolak batch secara keseluruhan (mis. JSON tidak valid)
+            raise Exception(f"Zabbix API Error: {response.get('error')}")
+    except Exception as e:
+        logger.error(f"Batch API call failed: {e}")
+        _record_stats("batch", time.perf_counter() - start, getattr(e, "retries", attempt), True)
+        return None
+
+    by_id = {item.get("id"): item for item in response}
+    results = []
+    for i, method in enumerate(methods):
+        item = by_id.get(i)
+        if item is None:
+            error = {"message": "No response for batch item"}
+        else:
+            error = item.get("error")
+        if error is not None:
+            logger.error(f"Zabbix API Error in batch item {i} ({method}): {error}")
+            results.append({"result": None, "error": error})
+        else:
+            results.append({"result": item["result"], "error": None})
+    _record_stats("batch", time.perf_counter() - start, attempt, False)
+    logger.debug(f"Batch API call successful: {label}")
+    return results
+
+def normalize_severities(severity):
+    """
+    Mengubah severity (int, list, tuple, atau range) menjadi list int yang terurut dan unik.
+    """
+    if isinstance(severity, (int, str)):
+        return [int(severity)]
+    return sorted({int(s) for s in severity})
+
+def build_problems_payload(severity=4, time_from=None, limit=None, eventid_till=None):
+    """
+    Menyusun payload problem.get untuk problem aktif dengan severity tertentu.
     """
     payload = {
         "jsonrpc": "2.0",
         "method": "problem.get",
         "params": {
-            "output": ["eventid", "name", "severity", "clock"],
+            "output": ["eventid", "objectid", "name", "severity", "clock"],
             "selectAcknowledges": ["message", "clock"],
             "selectTags": ["tag", "value"],
             "sortfield": "eventid",
             "sortorder": "DESC",
             "filter": {
-                "severity": severity
+                "severity": normalize_severities(severity)
             }
         },
         "id": 1
     }
-    result = call_api(payload)
+    if time_from is not None:
+        payload["params"]["time_from"] = int(time_from)
+    if limit is not None:
+        payload["params"]["limit"] = int(limit)
+    if eventid_till is not None:
+        payload["params"]["eventid_till"] = str(eventid_till)
+    return payload
+
+def get_active_high_problems(severity=4, time_from=None, limit=None, eventid_till=None):
+    """
+    Mengambil masalah aktif dengan severity tertentu dari Zabbix.
+    severity boleh berupa satu nilai atau list/range; semuanya diambil dalam satu problem.get.
+    Jika time_from diisi, hanya problem dengan clock >= time_from yang diambil.
+    limit dan eventid_till dipakai untuk paginasi (lihat iter_active_problems).
+    """
+    severity = normalize_severities(severity)
+    result = call_api(build_problems_payload(severity, time_from, limit, eventid_till))
     if result is None:
-        logging.warning(f"No problems retrieved for severity {severity}")
+        logger.warning(f"No problems retrieved for severity {severity}")
     else:
-        logging.info(f"Retrieved {len(result)} problems with severity {severity}")
+        logger.info(f"Retrieved {len(result)} problems with severity {severity}")
     return result
 
-def get_host_by_event(eventid):
+def get_problems_fanout(severity, time_from=None):
     """
-    Mengambil nama host berdasarkan event ID.
+    Mengambil problem per severity secara paralel (satu problem.get per severity) lalu
+    menggabungkannya, terurut eventid menurun. Dipakai bila filter array di server tidak cukup.
     """
-    payload = {
+    severities = normalize_severities(severity)
+    with ThreadPoolExecutor(max_workers=min(len(severities), API_POOL_SIZE)) as executor:
+        results = list(executor.map(lambda sev: get_active_high_problems(sev, time_from), severities))
+    if any(r is None for r in results):
+        return None
+    merged = [p for r in results for p in r]
+    merged.sort(key=lambda p: int(p["eventid"]), reverse=True)
+    return merged
+
+def iter_active_problems(severity=4, page_size=API_PAGE_SIZE, time_from=None):
+    """
+    Generator halaman problem aktif (list per halaman, eventid menurun).
+    Halaman berikutnya diminta dengan cursor eventid_till = eventid terakhir - 1,
+    sehingga hanya satu halaman yang ditahan di memori pada satu waktu.
+    """
+    cursor = None
+    while True:
+        page = get_active_high_problems(severity, time_from=time_from, limit=page_size, eventid_till=cursor)
+        if page is None:
+            raise RuntimeError(f"Failed to fetch problem page (eventid_till={cursor})")
+        if not page:
+            return
+        yield page
+        if len(page) < page_size:
+            return
+        cursor = min(int(p["eventid"]) for p in page) - 1
+
+def _get_problems(severity, time_from=None, fan_out=False):
+    if fan_out:
+        return get_problems_fanout(severity, time_from)
+    return get_active_high_problems(severity, time_from)
+
+def build_hosts_payload(eventids):
+    """
+    Menyusun payload event.get untuk mengambil host dari daftar event ID.
+    """
+    return {
         "jsonrpc": "2.0",
         "method": "event.get",
         "params": {
             "output": ["eventid"],
             "selectHosts": ["name"],
-            "eventids": eventid
+            "eventids": [str(e) for e in eventids]
         },
         "id": 2
     }
-    result = call_api(payload)
-    if result and len(result) > 0 and "hosts" in result[0] and result[0]["hosts"]:
-        host_name = result[0]["hosts"][0]["name"]
-        logging.debug(f"Host found for eventid {eventid}: {host_name}")
+
+def parse_hosts_result(result):
+    """
+    Mengubah hasil event.get (dengan selectHosts) menjadi dict {eventid: host_name}.
+    """
+    hosts = {}
+    for e in result or []:
+        if e.get("hosts"):
+            hosts[str(e["eventid"])] = e["hosts"][0]["name"]
+    return hosts
+
+def get_hosts_by_events(eventids):
+    """
+    Mengambil nama host untuk banyak event ID sekaligus dalam satu panggilan event.get.
+    Mengembalikan dict {eventid: host_name}.
+    """
+    eventids = [str(e) for e in eventids]
+    if not eventids:
+        return {}
+    cache = get_metadata_cache()
+    hosts, missing = cache.get_many("event_host", eventids)
+    if missing:
+        fetched = parse_hosts_result(call_api(build_hosts_payload(missing)))
+        cache.set_many("event_host", fetched)
+        hosts.update(fetched)
+    unresolved = len(eventids) - len(hosts)
+    if unresolved:
+        logger.warning(f"No host found for {unresolved} of {len(eventids)} events")
+    logger.debug(f"Resolved hosts for {len(hosts)} events ({len(eventids) - len(missing)} from cache)")
+    return hosts
+
+def get_host_by_event(eventid):
+    """
+    Mengambil nama host berdasarkan event ID.
+    """
+    host_name = get_hosts_by_events([eventid]).get(str(eventid))
+    if host_name:
+        logger.debug(f"Host found for eventid {eventid}: {host_name}")
         return host_name
-    logging.warning(f"No host found for eventid: {eventid}")
+    logger.warning(f"No host found for eventid: {eventid}")
     return "Unknown"
 
 def format_duration(seconds):
     """
-    Mengonversi detik ke format Xh Ym Zs.
+    Mengonversi detik ke format Xh Ym Zs (hanya untuk tampilan CLI).
     """
     hours = seconds // 3600
     minutes = (seconds % 3600) // 60
     seconds = seconds % 60
     result = f"{int(hours)}h {int(minutes)}m {int(seconds)}s"
-    logging.debug(f"Formatted duration {seconds}s to '{result}'")
+    sampled_debug(logger, "format_duration", "Formatted duration %ss to '%s'", seconds, result)
     return result
 
-def fetch_zabbix_data(severity=4):
+def build_recovered_payload(time_from):
+    """
+    Menyusun payload event.get untuk event OK (recovery) sejak time_from.
+    """
+    return {
+        "jsonrpc": "2.0",
+        "method": "event.get",
+        "params": {
+            "output": ["objectid"],
+            "source": 0,
+            "object": 0,
+            "value": 0,
+            "time_from": int(time_from)
+        },
+        "id": 3
+    }
+
+def build_open_events_payload(eventids):
+    """
+    Menyusun payload problem.get yang hanya mengembalikan eventid yang masih aktif.
+    """
+    return {
+        "jsonrpc": "2.0",
+        "method": "problem.get",
+        "params": {
+            "output": ["eventid"],
+            "eventids": [str(e) for e in eventids]
+        },
+        "id": 4
+    }
+
+def get_recovered_triggers(time_from):
+    """
+    Mengambil trigger ID yang mendapat event OK (recovery) sejak time_from.
+    """
+    result = call_api(build_recovered_payload(time_from))
+    if result is None:
+        return None
+    return {str(e["objectid"]) for e in result}
+
+def get_open_eventids(eventids):
+    """
+    Dari daftar event ID, mengembalikan set event yang masih berstatus problem.
+    """
+    result = call_api(build_open_events_payload(eventids))
+    if result is None:
+        return None
+    return {str(p["eventid"]) for p in result}
+
+def _full_sync(key, severity, now, fan_out):
+    problems = _get_problems(severity, fan_out=fan_out)
+    if problems is None:
+        return None
+    snap = {
+        "problems": {str(p["eventid"]): p for p in problems},
+        "hosts": get_hosts_by_events(p["eventid"] for p in problems),
+        "max_clock": max((int(p["clock"]) for p in problems), default=0),
+        "last_sync": now,
+        "full_sync": now
+    }
+    _snapshots[key] = snap
+    logger.info(f"Full problem sync for severity {severity}: {len(problems)} problems")
+    return snap
+
+def sync_problems(severity=4, full=False, fan_out=False):
+    """
+    Memperbarui snapshot lokal problem aktif dan mengembalikannya.
+    Setelah sinkronisasi penuh pertama, hanya problem baru (clock >= clock terakhir) dan
+    problem dari trigger yang mendapat event recovery yang ditanyakan ke Zabbix,
+    dalam dua JSON-RPC batch.
+    Sinkronisasi penuh diulang setiap SYNC_FULL_INTERVAL detik atau jika full=True.
+    """
+    key = ",".join(str(sev) for sev in normalize_severities(severity))
+    now = int(time.time())
+    with _snapshot_lock:
+        snap = _snapshots.get(key)
+        if full or snap is None or now - snap["full_sync"] >= SYNC_FULL_INTERVAL:
+            return _full_sync(key, severity, now, fan_out)
+
+        # Putaran 1: problem baru dan event recovery dalam satu batch
+        severities = normalize_severities(severity)
+        groups = [[sev] for sev in severities] if fan_out else [severities]
+        first = call_api_batch(
+            [build_problems_payload(g, time_from=snap["max_clock"]) for g in groups]
+            + [build_recovered_payload(snap["last_sync"] - SYNC_RECOVERY_OVERLAP)]
+        )
+        if first is None or any(item["error"] for item in first):
+            logger.warning("Delta sync failed, falling back to full sync")
+            return _full_sync(key, severity, now, fan_out)
+        new_problems = [p for item in first[:-1] for p in item["result"]]
+        recovered = {str(e["objectid"]) for e in first[-1]["result"]}
+
+        problems = snap["problems"]
+        candidates = [eid for eid, p in problems.items() if str(p.get("objectid")) in recovered]
+        new_problems = [p for p in new_problems if str(p["eventid"]) not in problems]
+
+        # Putaran 2: verifikasi kandidat resolved dan host (yang belum ada di cache) untuk problem baru
+        cache = get_metadata_cache()
+        new_hosts, missing_hosts = cache.get_many("event_host", (p["eventid"] for p in new_problems))
+        second = []
+        if candidates:
+            second.append(build_open_events_payload(candidates))
+        if missing_hosts:
+            second.append(build_hosts_payload(missing_hosts))
+        second = call_api_batch(second)
+        if second is None or (candidates and second[0]["error"]):
+            logger.warning("Delta sync failed, falling back to full sync")
+            return _full_sync(key, severity, now, fan_out)
+
+        resolved = []
+        if candidates:
+            still_open = {str(p["eventid"]) for p in second[0]["result"]}
+            resolved = [eid for eid in candidates if eid not in still_open]
+        for eid in resolved:
+            problems.pop(eid, None)
+            snap["hosts"].pop(eid, None)
+
+        if missing_hosts and not second[-1]["error"]:
+            fetched = parse_hosts_result(second[-1]["result"])
+            cache.set_many("event_host", fetched)
+            new_hosts.update(fetched)
+        snap["hosts"].update(new_hosts)
+        for p in new_problems:
+            problems[str(p["eventid"])] = p
+            snap["max_clock"] = max(snap["max_clock"], int(p["clock"]))
+        snap["last_sync"] = now
+        logger.info(
+            f"Delta problem sync for severity {severity}: {len(new_problems)} new, "
+            f"{len(resolved)} resolved, {len(problems)} open"
+        )
+        return snap
+
+def reset_problem_snapshot(severity=None):
+    """
+    Menghapus snapshot lokal sehingga sinkronisasi berikutnya kembali penuh.
+    """
+    with _snapshot_lock:
+        if severity is None:
+            _snapshots.clear()
+        else:
+            _snapshots.pop(",".join(str(sev) for sev in normalize_severities(severity)), None)
+
+def fetch_zabbix_data(severity=4, incremental=False, fan_out=False, page_size=None):
     """
     Mengambil data masalah dari Zabbix dan mengembalikan DataFrame.
+    severity boleh berupa satu nilai atau list/range (mis. [4, 5] untuk High + Disaster).
+    Jika incremental=True, data diambil dari snapshot lokal yang diperbarui secara delta.
+    Jika fan_out=True, setiap severity diambil dengan request terpisah secara paralel.
+    Jika page_size diisi, data diambil per halaman lewat iter_zabbix_data lalu digabung; ini
+    hanya memperpendek tiap request - hasil akhirnya tetap satu DataFrame penuh. Untuk memori
+    puncak yang dibatasi halaman, berikan iter_zabbix_data langsung ke analyze_data
+    (lihat batch_recap.py --page-size).
     """
-    problems = get_active_high_problems(severity)
+    if page_size and not incremental:
+        try:
+            chunks = list(iter_zabbix_data(severity, page_size=page_size))
+        except RuntimeError as e:
+            logger.error(f"Failed to fetch problems from Zabbix API for severity {severity}: {e}")
+            return None
+        if not chunks:
+            logger.error(f"Failed to fetch problems from Zabbix API for severity {severity}")
+            return None
+        import pandas as pd
+        df = pd.concat(chunks, ignore_index=True)
+        logger.info(f"Fetched {len(df)} problems from API in {len(chunks)} pages")
+        return df
+
+    if incremental:
+        snap = sync_problems(severity, fan_out=fan_out)
+        problems = None
+        if snap is not None:
+            problems = sorted(snap["problems"].values(), key=lambda p: int(p["eventid"]), reverse=True)
+            hosts = snap["hosts"]
+    else:
+        problems = _get_problems(severity, fan_out=fan_out)
+        if problems:
+            hosts = get_hosts_by_events(p["eventid"] for p in problems)
     if not problems:
-        logging.error(f"Failed to fetch problems from Zabbix API for severity {severity}")
+        logger.error(f"Failed to fetch problems from Zabbix API for severity {severity}")
         return None
     
+    df = problems_to_frame(problems, hosts, int(time.time()))
+    if df is not None:
+        if df.empty:
+            logger.warning("No problems found after processing")
+        else:
+            logger.info(f"Fetched {len(df)} problems from API")
+    return df
+
+def iter_zabbix_data(severity=4, page_size=API_PAGE_SIZE):
+    """
+    Generator DataFrame per halaman problem aktif. Host di-resolve per halaman, sehingga
+    baris pertama cepat tersedia dan memori puncak dibatasi oleh ukuran halaman.
+    """
     now = int(time.time())
-    data = []
-    for p in problems:
-        time_str = datetime.fromtimestamp(int(p["clock"])).strftime("%Y-%m-%d %H:%M:%S")
-        duration_seconds = now - int(p["clock"])
-        duration = format_duration(duration_seconds)
-        host = get_host_by_event(p["eventid"])
-        tags = p.get("tags", [])
-        tags_str = ", ".join(f"{t['tag']}:{t['value']}" for t in tags) or "None"
-        ack_msg = p["acknowledges"][0]["message"] if p.get("acknowledges") else "N/A"
-        
-        logging.debug(f"EventID: {p['eventid']}, Host: {host}, Problem: {p['name']}, Tags: {tags_str}")
-        
-        data.append({
-            "Time": time_str,
-            "Severity": p["severity"],
-            "Host": host,
-            "Status": "PROBLEM",
-            "Duration": duration,
-            "Problem": p["name"],
-            "Ack Message": ack_msg,
-            "Tags": tags_str,
-            "EventID": p["eventid"]
-        })
-    
+    total = 0
+    for page in iter_active_problems(severity, page_size=page_size):
+        hosts = get_hosts_by_events(p["eventid"] for p in page)
+        chunk = problems_to_frame(page, hosts, now)
+        if chunk is None:
+            return
+        total += len(chunk)
+        logger.debug(f"Fetched problem page with {len(chunk)} rows ({total} total)")
+        yield chunk
+    logger.info(f"Streamed {total} problems from API")
+
+def problems_to_frame(problems, hosts, now):
+    """
+    Menyusun DataFrame rekap dari list problem problem.get dan dict {eventid: host}.
+    Kolom dibangun per kolom (bukan per baris); selain kolom tampilan, clock (epoch) dan
+    duration_s (detik) disertakan agar konsumen tidak perlu mem-parse teks kembali. Kolom
+    Duration ("Xh Ym Zs") diturunkan dari duration_s agar frame tetap memenuhi kontrak kolom
+    export CSV (csv_ingest.REQUIRED_COLUMNS).
+    """
     try:
         import pandas as pd
-        df = pd.DataFrame(data)
-        if df.empty:
-            logging.warning("No problems found after processing")
-        else:
-            logging.info(f"Fetched {len(df)} problems from API")
-        return df
+        from dateutil.tz import tzlocal
     except ImportError:
-        logging.error("Pandas not installed, cannot create DataFrame")
+        logger.error("Pandas not installed, cannot create DataFrame")
         return None
 
+    eventids = [str(p["eventid"]) for p in problems]
+    clock = pd.Series([p["clock"] for p in problems], dtype="int64")
+    duration_s = now - clock
+    local_time = pd.to_datetime(clock, unit="s", utc=True).dt.tz_convert(tzlocal())
+    hours = (duration_s // 3600).astype(str)
+    minutes = ((duration_s % 3600) // 60).astype(str)
+    seconds = (duration_s % 60).astype(str)
+
+    df = pd.DataFrame({
+        "Time": local_time.dt.strftime("%Y-%m-%d %H:%M:%S"),
+        "Severity": [p["severity"] for p in problems],
+        "Host": [hosts.get(e, "Unknown") for e in eventids],
+        "Status": "PROBLEM",
+        "Duration": hours + "h " + minutes + "m " + seconds + "s",
+        "Problem": [p["name"] for p in problems],
+        "Ack Message": [p["acknowledges"][0]["message"] if p.get("acknowledges") else "N/A" for p in problems],
+        "Tags": [", ".join(f"{t['tag']}:{t['value']}" for t in p.get("tags", [])) or "None" for p in problems],
+        "EventID": eventids,
+        "clock": clock,
+        "duration_s": duration_s
+    })
+    logger.debug(f"Built problem frame with {len(df)} rows")
+    return df
+
 if __name__ == "__main__":
     print("Menarik data problem severity HIGH yang belum resolved...")
-    problems = get_active_high_problems()
-    if problems:
-        print(f"{'Time':<20} {'Severity':<10} {'Host':<25} {'Problem':<40} {'Duration':<15} {'Ack Message':<25} {'Tags':<30}")
-        print("-" * 170)
-        now = int(time.time())
-        for p in problems:
-            time_str = datetime.fromtimestamp(int(p["clock"])).strftime("%Y-%m-%d %H:%M:%S")
-            duration = format_duration(now - int(p["clock"]))
-            severity = p["severity"]
-            host = get_host_by_event(p["eventid"])
-            problem_name = p["name"]
-            ack_msg = p["acknowledges"][0]["message"] if p.get("acknowledges") else "N/A"
-            tags = ", ".join(f"{t['tag']}:{t['value']}" for t in p.get("tags", [])) or "None"
-
-            print(f"{time_str:<20} {severity:<10} {host[:23]+'...' if len(host) > 23 else host:<25} "
-                  f"{problem_name[:38]+'...' if len(problem_name) > 38 else problem_name:<40} "
-                  f"{duration:<15} "
-                  f"{ack_msg[:23]+'...' if len(ack_msg) > 23 else ack_msg:<25} "
-                  f"{tags[:28]+'...' if len(tags) > 28 else tags:<30}")
-    else:
-        print("Tidak ada problem aktif dengan severity High.")
\ No newline at end of file
+    printed = 0
+    now = int(time.time())
+    try:
+        for problems in iter_active_problems():
+            if not printed:
+                print(f"{'Time':<20} {'Severity':<10} {'Host':<25} {'Problem':<40} {'Duration':<15} {'Ack Message':<25} {'Tags':<30}")
+                print("-" * 170)
+            hosts = get_hosts_by_events(p["eventid"] for p in problems)
+            for p in problems:
+                time_str = datetime.fromtimestamp(int(p["clock"])).strftime("%Y-%m-%d %H:%M:%S")
+                duration = format_duration(now - int(p["clock"]))
+                severity = p["severity"]
+                host = hosts.get(str(p["eventid"]), "Unknown")
+                problem_name = p["name"]
+                ack_msg = p["acknowledges"][0]["message"] if p.get("acknowledges") else "N/A"
+                tags = ", ".join(f"{t['tag']}:{t['value']}" for t in p.get("tags", [])) or "None"
+
+                print(f"{time_str:<20} {severity:<10} {host[:23]+'...' if len(host) > 23 else host:<25} "
+                      f"{problem_name[:38]+'...' if len(problem_name) > 38 else problem_name:<40} "
+                      f"{duration:<15} "
+                      f"{ack_msg[:23]+'...' if len(ack_msg) > 23 else ack_msg:<25} "
+                      f"{tags[:28]+'...' if len(tags) > 28 else tags:<30}")
+            printed += len(problems)
+    except RuntimeError as e:
+        logger.error(str(e))
+        print("Gagal mengambil data problem dari Zabbix API.")
+    if not printed:
+        print("Tidak ada problem aktif dengan severity High.")
+    logger.info(f"API stats: {get_api_stats()}")
+    logger.info(f"Metadata cache stats: {get_metadata_cache().stats()}")
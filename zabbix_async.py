@@ -0,0 +1,136 @@
+import asyncio
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import zabbix_api
+
+logger = logging.getLogger(__name__)
+
+# Klien async di atas zabbix_api: setiap request tetap memakai requests (blocking) di thread
+# pekerja, sehingga event loop tidak tertahan. Pembatalan dan timeout hanya menghentikan
+# penantian; request HTTP yang sudah dikirim tetap berjalan sampai selesai (paling lama
+# API_TIMEOUT per percobaan, termasuk retry) dan memakai satu thread pekerja selama itu.
+
+# Konfigurasi klien async
+ASYNC_CONCURRENCY = 8
+ASYNC_TIMEOUT = 30
+HOST_BATCH_SIZE = 500
+
+_executor = None
+_executor_size = 0
+
+def _get_executor(size=None):
+    """
+    Executor bersama untuk request HTTP, minimal size thread (default ASYNC_CONCURRENCY).
+    Jika diminta lebih besar dari executor yang ada, executor baru dibuat; request di executor
+    lama tetap diselesaikan. Request tetap lewat session pooled di zabbix_api (retry, backoff,
+    statistik), sehingga API_POOL_SIZE sebaiknya >= size.
+    """
+    global _executor, _executor_size
+    size = size or ASYNC_CONCURRENCY
+    if _executor is None or size > _executor_size:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="zabbix-async")
+        _executor_size = size
+        logger.debug(f"Created async executor with {size} workers")
+        if zabbix_api.API_POOL_SIZE < size:
+            logger.warning(
+                f"API_POOL_SIZE ({zabbix_api.API_POOL_SIZE}) < async concurrency ({size}), "
+                "some connections will not be reused"
+            )
+    return _executor
+
+async def call_api(payload, timeout=ASYNC_TIMEOUT):
+    """
+    Versi async dari zabbix_api.call_api. Mengembalikan None jika gagal atau melewati timeout.
+    Pembatalan (cancel) dan timeout hanya menghentikan penantian; request yang sudah berjalan
+    tidak dibatalkan, selesai di thread pekerja dalam batas API_TIMEOUT dan hasilnya dibuang.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(_get_executor(), zabbix_api.call_api, payload)
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        logger.error(f"Async API call timed out after {timeout}s: {payload.get('method')}")
+        return None
+
+async def call_api_batch(payloads, timeout=ASYNC_TIMEOUT):
+    """
+    Versi async dari zabbix_api.call_api_batch (satu POST untuk banyak payload).
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(_get_executor(), zabbix_api.call_api_batch, payloads)
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        logger.error(f"Async batch API call timed out after {timeout}s")
+        return None
+
+async def call_many(payloads, concurrency=ASYNC_CONCURRENCY, timeout=ASYNC_TIMEOUT):
+    """
+    Menjalankan banyak payload secara bersamaan dengan batas concurrency; executor diperbesar
+    jika perlu agar concurrency tidak dibatasi jumlah thread.
+    Hasil dikembalikan sesuai urutan payload (None untuk yang gagal).
+    """
+    _get_executor(concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(payload):
+        async with semaphore:
+            return await call_api(payload, timeout)
+
+    return await asyncio.gather(*(run_one(p) for p in payloads))
+
+async def get_active_high_problems(severity=4, time_from=None, fan_out=False,
+                                   concurrency=ASYNC_CONCURRENCY, timeout=ASYNC_TIMEOUT):
+    """
+    Mengambil problem aktif. Jika fan_out=True, setiap severity diminta bersamaan.
+    """
+    severities = zabbix_api.normalize_severities(severity)
+    groups = [[sev] for sev in severities] if fan_out else [severities]
+    results = await call_many(
+        [zabbix_api.build_problems_payload(g, time_from) for g in groups], concurrency, timeout
+    )
+    if any(r is None for r in results):
+        logger.warning(f"No problems retrieved for severity {severities}")
+        return None
+    problems = [p for r in results for p in r]
+    if fan_out:
+        problems.sort(key=lambda p: int(p["eventid"]), reverse=True)
+    logger.info(f"Retrieved {len(problems)} problems with severity {severities}")
+    return problems
+
+async def get_hosts_by_events(eventids, concurrency=ASYNC_CONCURRENCY, timeout=ASYNC_TIMEOUT):
+    """
+    Mengambil host untuk event ID dalam beberapa batch event.get yang berjalan bersamaan.
+    Event yang sudah ada di cache metadata tidak diminta lagi.
+    """
+    eventids = [str(e) for e in eventids]
+    cache = zabbix_api.get_metadata_cache()
+    hosts, missing = cache.get_many("event_host", eventids)
+    batches = [missing[i:i + HOST_BATCH_SIZE] for i in range(0, len(missing), HOST_BATCH_SIZE)]
+    results = await call_many([zabbix_api.build_hosts_payload(b) for b in batches], concurrency, timeout)
+    for result in results:
+        fetched = zabbix_api.parse_hosts_result(result)
+        cache.set_many("event_host", fetched)
+        hosts.update(fetched)
+    missing = len(eventids) - len(hosts)
+    if missing:
+        logger.warning(f"No host found for {missing} of {len(eventids)} events")
+    return hosts
+
+async def fetch_zabbix_data(severity=4, fan_out=False, concurrency=ASYNC_CONCURRENCY, timeout=ASYNC_TIMEOUT):
+    """
+    Versi async dari zabbix_api.fetch_zabbix_data; mengembalikan DataFrame yang sama.
+    """
+    problems = await get_active_high_problems(severity, fan_out=fan_out, concurrency=concurrency, timeout=timeout)
+    if not problems:
+        logger.error(f"Failed to fetch problems from Zabbix API for severity {severity}")
+        return None
+    hosts = await get_hosts_by_events((p["eventid"] for p in problems), concurrency, timeout)
+    df = zabbix_api.problems_to_frame(problems, hosts, int(time.time()))
+    if df is not None:
+        logger.info(f"Fetched {len(df)} problems from API (async)")
+    return df